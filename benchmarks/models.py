@@ -0,0 +1,179 @@
+"""Compare record decoding against the previous pydantic models.
+
+Run from the repository root:
+
+    python -m benchmarks.models --output models.json
+
+Decodes a multi-day heart-rate payload and a year of daily_activity
+records (the shape a backfill sees) from bytes, then reads the fields a
+sensor would read. The stream rows split the body in socket-sized chunks
+and keep a running aggregate instead of a list of records. pydantic is
+optional; its rows are skipped when it is not installed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components" / "oura"))
+
+from api.models.base import json_loads
+from api.models.daily_activity import DailyActivity
+from api.models.heartrate import HeartRate
+from api.stream import RecordStream
+
+from .stub_server import daily_record, heartrate_sample
+
+try:
+    from pydantic import BaseModel
+except ImportError:
+    BaseModel = None
+
+if BaseModel is not None:
+
+    class PydanticHeartRate(BaseModel):
+        bpm: int
+        source: str
+        timestamp: str
+
+    class PydanticDailyActivityContributors(BaseModel):
+        meet_daily_targets: int
+        move_every_hour: int
+        recovery_time: int
+        stay_active: int
+        training_frequency: int
+        training_volume: int
+
+    class PydanticDailyActivity(BaseModel):
+        id: str
+        score: int
+        active_calories: int
+        average_met_minutes: float
+        contributors: PydanticDailyActivityContributors
+        equivalent_walking_distance: int
+        high_activity_met_minutes: int
+        high_activity_time: int
+        inactivity_alerts: int
+        low_activity_met_minutes: int
+        low_activity_time: int
+        medium_activity_met_minutes: int
+        medium_activity_time: int
+        meters_to_target: int
+        non_wear_time: int
+        resting_time: int
+        sedentary_met_minutes: int
+        sedentary_time: int
+        steps: int
+        target_calories: int
+        target_meters: int
+        total_calories: int
+        day: str
+        timestamp: str
+
+
+def heartrate_payload(days: int) -> bytes:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    samples = [
+        heartrate_sample(0, start + timedelta(minutes=5 * index))
+        for index in range(days * 288)
+    ]
+    return json.dumps({"data": samples, "next_token": None}).encode()
+
+
+def activity_payload(days: int) -> bytes:
+    start = date(2024, 1, 1)
+    records = [
+        daily_record(0, "daily_activity", start + timedelta(days=index))
+        for index in range(days)
+    ]
+    return json.dumps({"data": records, "next_token": None}).encode()
+
+
+def stream_bpm_mean(body: bytes, chunk_size: int = 16 * 1024) -> float:
+    stream = RecordStream()
+    total = count = 0
+    view = memoryview(body)
+    for offset in range(0, len(body), chunk_size):
+        for raw in stream.feed(view[offset:offset + chunk_size]):
+            total += HeartRate(json_loads(raw)).bpm
+            count += 1
+    stream.close()
+    return total / count
+
+
+def measure(decode: Callable[[bytes], Any], body: bytes, repeats: int) -> dict[str, float]:
+    decode(body)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        decode(body)
+    elapsed = (time.perf_counter() - started) / repeats
+
+    tracemalloc.start()
+    decode(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_bytes": peak}
+
+
+def main(args: argparse.Namespace) -> dict[str, Any]:
+    payloads = {
+        "heartrate": heartrate_payload(args.heartrate_days),
+        "daily_activity": activity_payload(args.activity_days),
+    }
+    cases: dict[str, dict[str, Callable[[bytes], Any]]] = {
+        "heartrate": {
+            "records": lambda body: [HeartRate(raw).bpm for raw in json_loads(body)["data"]],
+            "stream": stream_bpm_mean,
+        },
+        "daily_activity": {
+            "records": lambda body: [
+                (record.score, record.steps, record.contributors.stay_active)
+                for record in (DailyActivity(raw) for raw in json_loads(body)["data"])
+            ],
+        },
+    }
+    if BaseModel is not None:
+        cases["heartrate"]["pydantic"] = lambda body: [
+            PydanticHeartRate(**raw).bpm for raw in json.loads(body)["data"]
+        ]
+        cases["daily_activity"]["pydantic"] = lambda body: [
+            (record.score, record.steps, record.contributors.stay_active)
+            for record in (PydanticDailyActivity(**raw) for raw in json.loads(body)["data"])
+        ]
+
+    results = {}
+    for name, decoders in cases.items():
+        body = payloads[name]
+        results[name] = {
+            "payload_bytes": len(body),
+            **{
+                decoder: measure(decode, body, args.repeats)
+                for decoder, decode in decoders.items()
+            },
+        }
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--heartrate-days", type=int, default=30)
+    parser.add_argument("--activity-days", type=int, default=365)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    output = json.dumps(main(arguments), indent=2)
+    if arguments.output is None:
+        print(output)
+    else:
+        arguments.output.write_text(output + "\n")
@@ -0,0 +1,202 @@
+"""Benchmark OuraClient refreshes against the local stub server.
+
+Run from the repository root:
+
+    python -m benchmarks.run --entries 1 10 100 --ticks 12 --output results.json
+
+Each scenario creates one client per simulated config entry, sharing one
+session and request scheduler the way the integration's hub does, and
+drives them through a number of coordinator-style ticks five minutes
+apart. Results are written as JSON so runs can be compared over time.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+# The api package does not depend on Home Assistant, so it can be imported
+# on its own without loading the integration.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components" / "oura"))
+
+from api.client import OuraClient
+from api.scheduler import RequestScheduler
+
+from .stub_server import OuraStubServer
+
+TICK = timedelta(minutes=5)
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _lookup_table(result: dict[str, Any]) -> dict[str, Any]:
+    """Flatten endpoint results the way the coordinator does."""
+    table = {}
+    for data in result.values():
+        for item in data if isinstance(data, list) else [data]:
+            if item is not None:
+                table[item.lookup] = item
+    return table
+
+
+def _changed_lookups(previous: dict[str, Any], current: dict[str, Any]) -> int:
+    """Count lookups whose model changed, i.e. the lookups whose entities get written."""
+    changed = 0
+    for lookup in previous.keys() | current.keys():
+        old = previous.get(lookup)
+        new = current.get(lookup)
+        if old is not new and old != new:
+            changed += 1
+    return changed
+
+
+async def run_scenario(
+    entries: int,
+    ticks: int,
+    seed: int,
+    latency: float,
+    page_size: int | None,
+    rate_limit_every: int | None,
+    malformed_rate: float,
+) -> dict[str, Any]:
+    """Refresh every entry once per tick and collect timings."""
+    server = OuraStubServer(
+        seed=seed,
+        latency=latency,
+        page_size=page_size,
+        rate_limit_every=rate_limit_every,
+        malformed_rate=malformed_rate,
+    )
+    async with server, aiohttp.ClientSession() as session:
+        scheduler = RequestScheduler(base_backoff=0.01, max_backoff=0.1)
+        clients = [
+            OuraClient(server.url, session, f"token-{index}", scheduler=scheduler)
+            for index in range(entries)
+        ]
+        tables: list[dict[str, Any]] = [{} for _ in clients]
+
+        tick_latency = []
+        refresh_latency = []
+        cpu_per_tick = []
+        requests_per_tick = []
+        bytes_per_tick = []
+        changed_per_tick = []
+        failed_refreshes = 0
+        failed_endpoints = 0
+
+        tracemalloc.start()
+        allocated_start = tracemalloc.get_traced_memory()[0]
+
+        for _ in range(ticks):
+            server.reset_counters()
+            tracemalloc.reset_peak()
+            cpu_start = time.process_time()
+            tick_start = time.perf_counter()
+
+            async def refresh(index: int) -> None:
+                nonlocal failed_refreshes, failed_endpoints
+                started = time.perf_counter()
+                try:
+                    result = await clients[index].async_get_data()
+                except Exception:  # noqa: BLE001
+                    failed_refreshes += 1
+                    return
+                finally:
+                    refresh_latency.append(time.perf_counter() - started)
+                failed_endpoints += len(clients[index].endpoints) - len(result)
+                table = _lookup_table(result)
+                changed_per_tick[-1] += _changed_lookups(tables[index], table)
+                tables[index] = table
+
+            changed_per_tick.append(0)
+            await asyncio.gather(*(refresh(index) for index in range(entries)))
+
+            tick_latency.append(time.perf_counter() - tick_start)
+            cpu_per_tick.append(time.process_time() - cpu_start)
+            requests_per_tick.append(server.requests)
+            bytes_per_tick.append(server.bytes_sent)
+            server.advance(TICK)
+
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "entries": entries,
+        "ticks": ticks,
+        "refresh_latency_p50": _percentile(refresh_latency, 50),
+        "refresh_latency_p95": _percentile(refresh_latency, 95),
+        "tick_latency_mean": sum(tick_latency) / ticks,
+        "cpu_seconds_per_tick": sum(cpu_per_tick) / ticks,
+        "requests_per_refresh": sum(requests_per_tick) / (ticks * entries),
+        "bytes_per_refresh": sum(bytes_per_tick) / (ticks * entries),
+        "changed_lookups_per_tick": sum(changed_per_tick) / ticks,
+        "failed_refreshes": failed_refreshes,
+        "failed_endpoints": failed_endpoints,
+        "peak_allocated_bytes": peak,
+        "retained_bytes": current - allocated_start,
+        "scheduler": scheduler.diagnostics(),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    results = []
+    for entries in args.entries:
+        results.append(
+            await run_scenario(
+                entries,
+                args.ticks,
+                args.seed,
+                args.latency,
+                args.page_size,
+                args.rate_limit_every,
+                args.malformed_rate,
+            )
+        )
+    return {
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "latency": args.latency,
+        "page_size": args.page_size,
+        "rate_limit_every": args.rate_limit_every,
+        "malformed_rate": args.malformed_rate,
+        "scenarios": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--ticks", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--page-size", type=int, default=None)
+    parser.add_argument("--rate-limit-every", type=int, default=None, help="answer every Nth request with a 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="fraction of truncated bodies")
+    parser.add_argument("--output", type=Path, default=None, help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+    output = json.dumps(asyncio.run(main(arguments)), indent=2)
+    if arguments.output is None:
+        print(output)
+    else:
+        arguments.output.write_text(output + "\n")
@@ -0,0 +1,359 @@
+"""Local stand-in for the Oura v2 API used by the benchmarks.
+
+Payloads are generated from a seed so every run sees the same data. The
+server keeps a virtual clock that the harness advances between ticks, so
+heart-rate samples accumulate through the day the way they do for real
+while daily records stay the same.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import random
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, Self
+
+from aiohttp import web
+
+DAILY_ENDPOINTS = (
+    "daily_readiness",
+    "daily_resilience",
+    "daily_sleep",
+    "sleep",
+    "daily_stress",
+    "daily_activity",
+    "daily_cardiovascular_age",
+    "daily_spo2",
+    "vO2_max",
+    "workout",
+    "session",
+    "enhanced_tag",
+)
+
+HEARTRATE_INTERVAL = timedelta(minutes=5)
+
+
+class OuraStubServer:
+    """aiohttp server serving seeded Oura v2 usercollection payloads."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        now: datetime | None = None,
+        latency: float = 0.0,
+        page_size: int | None = None,
+        rate_limit_every: int | None = None,
+        malformed_rate: float = 0.0,
+    ) -> None:
+        self.seed = seed
+        self.now = now or datetime.now(UTC).replace(second=0, microsecond=0)
+        self.latency = latency
+        self.page_size = page_size
+        self.rate_limit_every = rate_limit_every
+        self.malformed_rate = malformed_rate
+        self._random = random.Random(seed)
+        self.requests = 0
+        self.bytes_sent = 0
+        self.requests_by_endpoint: dict[str, int] = {}
+        self._runner: web.AppRunner | None = None
+        self.port: int | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v2/usercollection"
+
+    def advance(self, delta: timedelta) -> None:
+        """Move the virtual clock forward."""
+        self.now += delta
+
+    def reset_counters(self) -> None:
+        self.requests = 0
+        self.bytes_sent = 0
+        self.requests_by_endpoint = {}
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/v2/usercollection/personal_info", self._personal_info)
+        app.router.add_get("/v2/usercollection/{endpoint}", self._collection)
+        app.router.add_get("/v2/usercollection/{endpoint}/{document_id}", self._document)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    async def _respond(self, endpoint: str, payload: Any) -> web.Response:
+        self.requests += 1
+        number = self.requests
+        self.requests_by_endpoint[endpoint] = self.requests_by_endpoint.get(endpoint, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.rate_limit_every and number % self.rate_limit_every == 0:
+            return web.json_response(
+                {"detail": "Too many requests"}, status=429, headers={"Retry-After": "1"}
+            )
+        body = json.dumps(payload).encode()
+        if self.malformed_rate and self._random.random() < self.malformed_rate:
+            body = body[: len(body) // 2]
+        self.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json")
+
+    async def _personal_info(self, request: web.Request) -> web.Response:
+        return await self._respond(
+            "personal_info",
+            {
+                "id": "stub-user",
+                "age": 35,
+                "weight": 72.5,
+                "height": 1.78,
+                "biological_sex": "female",
+                "email": "stub@example.com",
+            },
+        )
+
+    async def _collection(self, request: web.Request) -> web.Response:
+        endpoint = request.match_info["endpoint"]
+        if endpoint == "heartrate":
+            records = self._heartrate(request.query)
+        elif endpoint in DAILY_ENDPOINTS:
+            records = self._daily(endpoint, request.query)
+        else:
+            return web.json_response({"detail": "Not found"}, status=404)
+
+        next_token = None
+        offset = _decode_token(request.query.get("next_token"))
+        if self.page_size:
+            page = records[offset : offset + self.page_size]
+            if offset + self.page_size < len(records):
+                next_token = _encode_token(offset + self.page_size)
+            records = page
+        return await self._respond(endpoint, {"data": records, "next_token": next_token})
+
+    async def _document(self, request: web.Request) -> web.Response:
+        endpoint = request.match_info["endpoint"]
+        document_id = request.match_info["document_id"]
+        # Document ids end with the ISO day, see daily_record.
+        day = date.fromisoformat(document_id[-10:])
+        return await self._respond(endpoint, daily_record(self.seed, endpoint, day))
+
+    def _daily(self, endpoint: str, query) -> list[dict[str, Any]]:
+        today = self.now.date()
+        start = date.fromisoformat(query.get("start_date", (today - timedelta(days=7)).isoformat()))
+        end = min(date.fromisoformat(query.get("end_date", today.isoformat())), today)
+        records = []
+        day = start
+        while day <= end:
+            records.append(daily_record(self.seed, endpoint, day))
+            day += timedelta(days=1)
+        return records
+
+    def _heartrate(self, query) -> list[dict[str, Any]]:
+        start = _parse_datetime(query.get("start_datetime")) or self.now - timedelta(days=1)
+        end = min(_parse_datetime(query.get("end_datetime")) or self.now, self.now)
+        # Samples sit on a fixed 5-minute grid.
+        step = HEARTRATE_INTERVAL.total_seconds()
+        timestamp = datetime.fromtimestamp(
+            -(-start.timestamp() // step) * step, UTC
+        )
+        samples = []
+        while timestamp <= end:
+            samples.append(heartrate_sample(self.seed, timestamp))
+            timestamp += HEARTRATE_INTERVAL
+        return samples
+
+
+def daily_record(seed: int, endpoint: str, day: date) -> dict[str, Any]:
+    """Return the seeded record of a daily endpoint for a day."""
+    rng = random.Random(f"{seed}-{endpoint}-{day.isoformat()}")
+    record: dict[str, Any] = {
+        "id": f"{endpoint}-{day.isoformat()}",
+        "day": day.isoformat(),
+        "timestamp": f"{day.isoformat()}T07:{rng.randint(0, 59):02d}:00+00:00",
+    }
+    score = rng.randint(55, 95)
+    if endpoint == "daily_readiness":
+        record |= {
+            "score": score,
+            "temperature_deviation": round(rng.uniform(-0.5, 0.5), 2),
+            "temperature_trend_deviation": round(rng.uniform(-0.5, 0.5), 2),
+            "contributors": _contributors(rng, (
+                "activity_balance", "body_temperature", "hrv_balance",
+                "previous_day_activity", "previous_night", "recovery_index",
+                "resting_heart_rate", "sleep_balance",
+            )),
+        }
+    elif endpoint == "daily_sleep":
+        record |= {
+            "score": score,
+            "contributors": _contributors(rng, (
+                "deep_sleep", "efficiency", "latency", "rem_sleep",
+                "restfulness", "timing", "total_sleep",
+            )),
+        }
+    elif endpoint == "sleep":
+        epochs = rng.randint(84, 108)
+        start = datetime.combine(day, datetime.min.time(), UTC) - timedelta(
+            minutes=rng.randint(30, 90)
+        )
+        phases = "".join(rng.choice("12223334") for _ in range(epochs))
+        series_start = start.isoformat()
+        record |= {
+            "type": "long_sleep",
+            "bedtime_start": start.isoformat(),
+            "bedtime_end": (start + epochs * timedelta(minutes=5)).isoformat(),
+            "time_in_bed": epochs * 300,
+            "total_sleep_duration": (epochs - phases.count("4")) * 300,
+            "deep_sleep_duration": phases.count("1") * 300,
+            "light_sleep_duration": phases.count("2") * 300,
+            "rem_sleep_duration": phases.count("3") * 300,
+            "awake_time": phases.count("4") * 300,
+            "efficiency": rng.randint(75, 98),
+            "latency": rng.randint(120, 1800),
+            "average_breath": round(rng.uniform(12, 16), 3),
+            "average_heart_rate": round(rng.uniform(48, 60), 3),
+            "average_hrv": rng.randint(25, 90),
+            "lowest_heart_rate": rng.randint(42, 52),
+            "sleep_phase_5_min": phases,
+            "heart_rate": {
+                "interval": 300.0,
+                "items": [None if rng.random() < 0.05 else rng.randint(44, 70) for _ in range(epochs)],
+                "timestamp": series_start,
+            },
+            "hrv": {
+                "interval": 300.0,
+                "items": [None if rng.random() < 0.05 else rng.randint(15, 120) for _ in range(epochs)],
+                "timestamp": series_start,
+            },
+        }
+    elif endpoint == "daily_resilience":
+        record |= {
+            "level": rng.choice(("limited", "adequate", "solid", "strong", "exceptional")),
+            "contributors": {
+                "sleep_recovery": round(rng.uniform(40, 90), 1),
+                "daytime_recovery": round(rng.uniform(20, 80), 1),
+                "stress": round(rng.uniform(20, 80), 1),
+            },
+        }
+    elif endpoint == "daily_stress":
+        record |= {
+            "stress_high": rng.randint(0, 18000),
+            "recovery_high": rng.randint(0, 18000),
+            "day_summary": rng.choice(("restored", "normal", "stressful", None)),
+        }
+    elif endpoint == "daily_cardiovascular_age":
+        record |= {"vascular_age": rng.randint(25, 60)}
+    elif endpoint == "daily_spo2":
+        record |= {
+            "spo2_percentage": {"average": round(rng.uniform(94, 99), 3)},
+            "breathing_disturbance_index": rng.randint(0, 20),
+        }
+    elif endpoint == "vO2_max":
+        record |= {"vo2_max": round(rng.uniform(30, 55), 1)}
+    elif endpoint in ("workout", "session", "enhanced_tag"):
+        start = datetime.combine(day, datetime.min.time(), UTC) + timedelta(
+            hours=rng.randint(7, 19)
+        )
+        end = start + timedelta(minutes=rng.randint(10, 90))
+        if endpoint == "workout":
+            record |= {
+                "activity": rng.choice(("walking", "running", "cycling", "yoga")),
+                "calories": round(rng.uniform(50, 700), 1),
+                "distance": round(rng.uniform(500, 12000), 1),
+                "intensity": rng.choice(("easy", "moderate", "hard")),
+                "label": None,
+                "source": rng.choice(("manual", "autodetected", "confirmed")),
+                "start_datetime": start.isoformat(),
+                "end_datetime": end.isoformat(),
+            }
+        elif endpoint == "session":
+            record |= {
+                "type": rng.choice(("breathing", "meditation", "relaxation", "rest")),
+                "mood": rng.choice(("bad", "worse", "same", "good", "great", None)),
+                "start_datetime": start.isoformat(),
+                "end_datetime": end.isoformat(),
+            }
+        else:
+            record |= {
+                "tag_type_code": rng.choice(("tag_generic_caffeine", "tag_generic_alcohol", None)),
+                "custom_name": None,
+                "comment": None,
+                "start_day": day.isoformat(),
+                "start_time": start.isoformat(),
+                "end_day": None,
+                "end_time": None,
+            }
+    elif endpoint == "daily_activity":
+        record |= {
+            "score": score,
+            "active_calories": rng.randint(200, 900),
+            "average_met_minutes": round(rng.uniform(1, 2), 3),
+            "contributors": _contributors(rng, (
+                "meet_daily_targets", "move_every_hour", "recovery_time",
+                "stay_active", "training_frequency", "training_volume",
+            )),
+            "equivalent_walking_distance": rng.randint(2000, 15000),
+            "high_activity_met_minutes": rng.randint(0, 100),
+            "high_activity_time": rng.randint(0, 3600),
+            "inactivity_alerts": rng.randint(0, 4),
+            "low_activity_met_minutes": rng.randint(50, 300),
+            "low_activity_time": rng.randint(3600, 20000),
+            "medium_activity_met_minutes": rng.randint(0, 200),
+            "medium_activity_time": rng.randint(0, 7200),
+            "meters_to_target": rng.randint(0, 8000),
+            "non_wear_time": rng.randint(0, 3600),
+            "resting_time": rng.randint(20000, 40000),
+            "sedentary_met_minutes": rng.randint(0, 50),
+            "sedentary_time": rng.randint(10000, 40000),
+            "steps": rng.randint(2000, 20000),
+            "target_calories": rng.randint(300, 700),
+            "target_meters": rng.randint(6000, 12000),
+            "total_calories": rng.randint(1800, 3200),
+        }
+    return record
+
+
+def heartrate_sample(seed: int, timestamp: datetime) -> dict[str, Any]:
+    """Return the seeded heart-rate sample at a timestamp."""
+    rng = random.Random(f"{seed}-{int(timestamp.timestamp())}")
+    hour = timestamp.hour
+    asleep = hour < 6
+    return {
+        "bpm": rng.randint(48, 60) if asleep else rng.randint(58, 120),
+        "source": "sleep" if asleep else rng.choice(("awake", "awake", "rest", "workout")),
+        "timestamp": timestamp.isoformat(),
+    }
+
+
+def _contributors(rng: random.Random, names: tuple[str, ...]) -> dict[str, int]:
+    return {name: rng.randint(40, 100) for name in names}
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed
+
+
+def _encode_token(offset: int) -> str:
+    return base64.urlsafe_b64encode(str(offset).encode()).decode()
+
+
+def _decode_token(token: str | None) -> int:
+    if not token:
+        return 0
+    return int(base64.urlsafe_b64decode(token.encode()).decode())
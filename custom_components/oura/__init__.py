@@ -1,38 +1,167 @@
 """The Oura integration."""
 from __future__ import annotations
 
+from datetime import timedelta
 import secrets
 import logging
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform, CONF_TOKEN, CONF_NAME
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import Platform, CONF_TOKEN, CONF_NAME, CONF_WEBHOOK_ID
+from homeassistant.components import webhook
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, API_ENDPOINT
+from .const import (
+    DOMAIN,
+    API_ENDPOINT,
+    MAX_CONCURRENT_REQUESTS,
+    ENDPOINT_TIMEOUT,
+    STORAGE_VERSION,
+    SERVICE_BACKFILL,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_START_DATE,
+    ATTR_END_DATE,
+    CONF_PUSH,
+    CONF_VERIFICATION_TOKEN,
+    CONF_DEBUG_TIMINGS,
+    CONF_LIVE_HEARTRATE,
+    CONF_LIVE_HEARTRATE_INTERVAL,
+    DEFAULT_LIVE_HEARTRATE_INTERVAL,
+)
 from .oura_update_coordinator import OuraUpdateCoordinator
+from .sensor import entity_lookups
 from .api.client import OuraClient
+from .api.instrumentation import Instrumentation
+from .backfill import OuraBackfill
+from .hub import async_get_hub, async_release_hub
+from .webhook import OuraWebhookManager
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
 _LOGGER = logging.getLogger(__name__)
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Oura services."""
+
+    async def async_backfill(call: ServiceCall) -> None:
+        """Backfill history for one config entry into long-term statistics."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+        if entry_data is None:
+            raise ServiceValidationError(f"Oura config entry {entry_id} is not loaded")
+
+        start = call.data[ATTR_START_DATE]
+        end = call.data.get(ATTR_END_DATE, dt_util.now().date())
+        if start > end:
+            raise ServiceValidationError("start_date must not be after end_date")
+
+        entry_data["backfill"].async_start(start, end)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, async_backfill, schema=BACKFILL_SCHEMA
+    )
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Oura from a config entry."""
     token: str = entry.data[CONF_TOKEN]
     name: str = entry.data[CONF_NAME]
 
-    websession = async_get_clientsession(hass)
-    client = OuraClient(API_ENDPOINT, websession, token)
-    coordinator = OuraUpdateCoordinator(hass, client)
+    hub = async_get_hub(hass)
+    offset = hub.async_register(entry.entry_id)
+    client = OuraClient(
+        API_ENDPOINT,
+        hub.session,
+        token,
+        max_concurrency=MAX_CONCURRENT_REQUESTS,
+        endpoint_timeout=ENDPOINT_TIMEOUT,
+        scheduler=hub.scheduler,
+        instrumentation=Instrumentation(entry.options.get(CONF_DEBUG_TIMINGS, False)),
+    )
+    store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+    coordinator = OuraUpdateCoordinator(hass, client, store)
+    # Endpoints whose sensors are all disabled are never requested.
+    coordinator.set_wanted_lookups(entity_lookups(hass, entry))
+    if entry.options.get(CONF_LIVE_HEARTRATE):
+        coordinator.set_live_heartrate(
+            timedelta(
+                seconds=entry.options.get(
+                    CONF_LIVE_HEARTRATE_INTERVAL, DEFAULT_LIVE_HEARTRATE_INTERVAL
+                )
+            )
+        )
 
-    await coordinator.async_config_entry_first_refresh()
+    # Show the cached values straight away and refresh in the background,
+    # staggered against the other entries; only block on the API when there
+    # is nothing cached yet.
+    try:
+        if await coordinator.async_restore():
+            entry.async_create_background_task(
+                hass,
+                hub.async_staggered(offset, coordinator.async_refresh()),
+                f"{DOMAIN} refresh {entry.entry_id}",
+            )
+        else:
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await async_release_hub(hass, entry.entry_id)
+        raise
+    hub.engine.async_add(entry.entry_id, coordinator)
+
+    push = None
+    if entry.options.get(CONF_PUSH):
+        if CONF_WEBHOOK_ID not in entry.data or CONF_VERIFICATION_TOKEN not in entry.data:
+            hass.config_entries.async_update_entry(
+                entry,
+                data={
+                    CONF_WEBHOOK_ID: webhook.async_generate_id(),
+                    CONF_VERIFICATION_TOKEN: secrets.token_urlsafe(16),
+                    **entry.data,
+                },
+            )
+        push = OuraWebhookManager(hass, entry, coordinator, hub.session, hub.scheduler)
+        if not await push.async_setup():
+            push = None
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
+        "client": client,
+        "backfill": OuraBackfill(hass, entry, client),
+        "push": push,
         "name": name
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    return True
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
 
-    return True
\ No newline at end of file
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        if entry_data["push"] is not None:
+            await entry_data["push"].async_unload()
+        await async_release_hub(hass, entry.entry_id)
+    return unload_ok
\ No newline at end of file
@@ -1,31 +1,218 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
+from dataclasses import dataclass
+from http import HTTPStatus
+import asyncio
+from contextlib import aclosing
+from contextvars import ContextVar
 import secrets
 import logging
 
+from collections.abc import AsyncIterator, Iterable
 from typing import Any
 
 from aiohttp import ClientResponse
+from .models.base import json_loads
+from .stream import RecordStream
 from .models.ring_configuration import RingConfiguration
-from .models.daily_readiness import DailyReadiness
-from .models.daily_resilience import DailyResilience
-from .models.daily_sleep import DailySleep
-from .models.daily_stress import DailyStress
-from .models.heartrate import HeartRate
-from .models.daily_cardiovascular_age import DailyCardiovascularAge
-from .models.personal_info import PersonalInfo
-from .models.daily_activity import DailyActivity
+from .models.heartrate import HeartRate, HeartRateSummary
+from .models.sleep import Sleep
+from .endpoints import (
+    ENDPOINTS,
+    MODELS,
+    PARAMS_DATE,
+    PARAMS_DATETIME,
+    FETCH_DOCUMENT,
+    FETCH_CUSTOM,
+)
+from .heartrate_series import HeartRateSeries
+from .sleep_session import SleepSession, main_periods
+from .scheduler import RequestScheduler
+from .instrumentation import Instrumentation
 
 _LOGGER = logging.getLogger(__name__)
 
+@dataclass
+class _CacheEntry:
+    """Last result seen for an endpoint and query window."""
+
+    params: dict[str, str] | None
+    result: Any
+    etag: str | None = None
+    last_modified: str | None = None
+    last_timestamp: str | None = None
+    last_day: str | None = None
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_ENDPOINT_TIMEOUT = 8
+# Bytes read from the socket per step when streaming a collection.
+STREAM_CHUNK_SIZE = 16 * 1024
+# Batches of records read ahead while the caller works through earlier ones.
+PREFETCH_BATCHES = 8
+
+_DONE = object()
+
+# Timeout of the endpoint fetch in progress, handed to the scheduler so it
+# does not start a retry or rate-limit wait the timeout would cut short.
+_fetch_timeout: ContextVar[asyncio.Timeout | None] = ContextVar(
+    "oura_fetch_timeout", default=None
+)
+
+class Collection:
+    """The records of one usercollection query, read page by page.
+
+    Iterate with ``async for`` to get every record, or use ``batches()`` to
+    get them in the lists completed by each chunk of the body. A background
+    reader streams the pages, following next_token, into a small queue, so
+    the next page is already being downloaded while the caller is still
+    working through the current one. In latest mode only the newest record
+    is decoded and yielded.
+
+    After iteration ``not_modified``, ``etag`` and ``last_modified`` describe
+    the first page's response. Close the iterator (e.g. with
+    contextlib.aclosing) when stopping early so the reader stops straight
+    away.
+    """
+
+    def __init__(
+        self,
+        client: "OuraClient",
+        endpoint: str,
+        params: dict[str, str] | None,
+        model: type | None = None,
+        latest: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self._client = client
+        self.endpoint = endpoint
+        self._path = ENDPOINTS[endpoint].path if endpoint in ENDPOINTS else endpoint
+        self._params = params or {}
+        self._model = model
+        self._latest = latest
+        self._headers = headers
+        self.not_modified = False
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._async_iter_records()
+
+    async def _async_iter_records(self) -> AsyncIterator[Any]:
+        model = self._model
+        async with aclosing(self.batches()) as batches:
+            async for batch in batches:
+                for raw in batch:
+                    yield raw if model is None else model(raw)
+
+    async def batches(self) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the decoded records completed by each chunk of the body."""
+        queue: asyncio.Queue = asyncio.Queue(PREFETCH_BATCHES)
+        reader = asyncio.create_task(self._async_read(queue))
+        latest = None
+        try:
+            while (batch := await queue.get()) is not _DONE:
+                if isinstance(batch, Exception):
+                    raise batch
+                if self._latest:
+                    latest = batch[-1]
+                else:
+                    yield [json_loads(raw) for raw in batch]
+            if latest is not None:
+                yield [json_loads(latest)]
+        finally:
+            reader.cancel()
+
+    async def _async_read(self, queue: asyncio.Queue) -> None:
+        """Read every page into the queue, ending with _DONE or the error raised."""
+        params = self._params
+        headers = self._headers
+        try:
+            while next_token := await self._async_read_page(params, headers, queue):
+                params = {**params, "next_token": next_token}
+                headers = None
+        except Exception as err:  # noqa: BLE001 - raised again by the consumer
+            await queue.put(err)
+            return
+        await queue.put(_DONE)
+
+    async def _async_read_page(
+        self,
+        params: dict[str, str],
+        headers: dict[str, str] | None,
+        queue: asyncio.Queue,
+    ) -> str | None:
+        """Stream one page into the queue and return its next_token."""
+        endpoint = self.endpoint
+        instrumentation = self._client.instrumentation
+        stream = RecordStream()
+        with instrumentation.span(endpoint, "request"):
+            response = await self._client._async_send(
+                "GET", self._path, params=params, headers=headers,
+            )
+        try:
+            if headers is not None:
+                self.etag = response.headers.get("ETag")
+                self.last_modified = response.headers.get("Last-Modified")
+                if response.status == HTTPStatus.NOT_MODIFIED:
+                    self.not_modified = True
+                    return None
+            if response.status >= HTTPStatus.BAD_REQUEST:
+                data = json_loads(await response.read())
+                _LOGGER.error("Failed to get %s from Oura API: %s", endpoint, str(data))
+                _raise_auth_or_response_error(data)
+
+            # The body is decoded as it arrives, so this phase also covers
+            # reading it from the connection.
+            with instrumentation.span(endpoint, "decode"):
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    instrumentation.add_bytes(endpoint, len(chunk))
+                    records = stream.feed(chunk)
+                    if records:
+                        await queue.put(records)
+                envelope = stream.close()
+        except ValueError as err:
+            _LOGGER.error("Failed to decode %s from Oura API: %s", endpoint, err)
+            raise InvalidOuraAPIResponseError(str(err)) from err
+        finally:
+            response.release()
+
+        if not isinstance(envelope, dict) or "data" not in envelope:
+            _LOGGER.error("Failed to get %s from Oura API: %s", endpoint, str(envelope))
+            _raise_auth_or_response_error(envelope)
+        return envelope.get("next_token")
+
+
 class OuraClient:
-    def __init__(self, host: str, session, token: str):
+    def __init__(
+        self,
+        host: str,
+        session,
+        token: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        endpoint_timeout: float = DEFAULT_ENDPOINT_TIMEOUT,
+        scheduler: RequestScheduler | None = None,
+        instrumentation: Instrumentation | None = None,
+    ):
         self._host = host
         self._session = session
         self._token = token
+        self.scheduler = scheduler or RequestScheduler()
+        self.instrumentation = instrumentation or Instrumentation()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._endpoint_timeout = endpoint_timeout
+        self._cache: dict[str, _CacheEntry] = {}
+        self.heartrate_series = HeartRateSeries()
+        self._heartrate_result: list[HeartRate | HeartRateSummary] = []
+        self.sleep_sessions: dict[str, SleepSession] = {}
+        # Endpoints that need more than the registry's generic fetch.
+        self._custom_fetches = {
+            "ring": self.async_get_ring_configuration,
+            "sleep": self.async_sleep,
+            "heartrate": self.async_heartrate,
+        }
     
-    async def make_request(self, method, url, **kwargs) -> ClientResponse:
-        """Make a request."""
-        headers = kwargs.get("headers")
+    async def _async_send(self, method, url, **kwargs) -> ClientResponse:
+        """Send an authenticated request and return the raw response."""
+        headers = kwargs.pop("headers", None)
 
         if headers is None:
             headers = {}
@@ -33,26 +220,164 @@ class OuraClient:
             headers = dict(headers)
 
         headers["Authorization"] = f"Bearer {self._token}"
-        response = await self._session.request(
-            method, f"{self._host}/{url}", **kwargs, headers=headers,
+        timeout = None
+        if (fetch_timeout := _fetch_timeout.get()) is not None:
+            timeout = fetch_timeout.when() - asyncio.get_running_loop().time()
+        return await self.scheduler.async_run(
+            lambda: self._session.request(
+                method, f"{self._host}/{url}", **kwargs, headers=headers,
+            ),
+            timeout=timeout,
+        )
+
+    async def make_request(self, method, url, **kwargs) -> ClientResponse:
+        """Make a request."""
+        instrumentation = self.instrumentation
+        with instrumentation.span(url, "request"):
+            response = await self._async_send(method, url, **kwargs)
+            body = await response.read()
+        instrumentation.add_bytes(url, len(body))
+        with instrumentation.span(url, "decode"):
+            return json_loads(body)
+
+    def iter_collection(
+        self,
+        endpoint: str,
+        model: type | None = None,
+        start: date | datetime | str | None = None,
+        end: date | datetime | str | None = None,
+        *,
+        latest: bool = False,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Collection:
+        """Return the records of a collection between start and end, across every page.
+
+        Records are raw dicts unless a model is given. With latest=True only
+        the newest record is returned.
+        """
+        return Collection(
+            self,
+            endpoint,
+            {**collection_params(endpoint, start, end), **(params or {})},
+            model,
+            latest=latest,
+            headers=headers,
+        )
+
+    async def async_get_latest(
+        self,
+        endpoint: str,
+        model: type,
+        params: dict[str, str] | None = None,
+    ) -> Any:
+        """Return the newest record of a collection, reusing the last one when unchanged.
+
+        The cache is keyed by endpoint and query window. When the window is
+        the same as last time the request carries conditional headers and is
+        narrowed to start at the last record seen, so only newer records are
+        downloaded. A not-modified, empty narrowed or identical response
+        returns the cached record object itself.
+        """
+        entry = self._cache.get(endpoint)
+        if entry is not None and entry.params != params:
+            entry = None
+
+        headers = {}
+        request_params = params
+        if entry is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+            request_params = _narrow_params(params, entry)
+
+        collection = self.iter_collection(
+            endpoint, model, latest=True, params=request_params, headers=headers,
+        )
+        result = None
+        async for result in collection:
+            pass
+
+        if entry is not None:
+            if collection.not_modified or result == entry.result:
+                return entry.result
+            if result is None and request_params is not params:
+                return entry.result
+        if result is None:
+            _LOGGER.warning("No %s records from Oura API", endpoint)
+
+        self._cache[endpoint] = _CacheEntry(
+            params=params,
+            result=result,
+            etag=collection.etag,
+            last_modified=collection.last_modified,
+            last_timestamp=getattr(result, "timestamp", None),
+            last_day=getattr(result, "day", None),
+        )
+        return result
+
+    @property
+    def endpoints(self) -> list[str]:
+        """Names of the endpoints this client can fetch, keyed by model lookup."""
+        return list(ENDPOINTS)
+
+    async def async_fetch(self, name: str) -> Any:
+        """Fetch one registered endpoint the way its registry entry describes."""
+        endpoint = ENDPOINTS[name]
+        if endpoint.fetch == FETCH_CUSTOM:
+            return await self._custom_fetches[name]()
+        if endpoint.fetch == FETCH_DOCUMENT:
+            return await self.async_get_document(name)
+        params = build_date_params() if endpoint.params == PARAMS_DATE else None
+        return await self.async_get_latest(name, endpoint.model, params)
+
+    async def async_get_data(self, endpoints: Iterable[str] | None = None) -> dict[str, Any]:
+        """Fetch endpoints concurrently.
+
+        Returns the result of each endpoint that was fetched successfully,
+        keyed by endpoint name. An endpoint that fails or times out is left
+        out so only its own sensors go unavailable. If every endpoint fails
+        the first error is raised so the coordinator marks the update as
+        failed.
+        """
+        names = list(ENDPOINTS) if endpoints is None else list(endpoints)
+        results = await asyncio.gather(
+            *(self._async_fetch_endpoint(name) for name in names),
+            return_exceptions=True,
         )
-        return await response.json()
-
-    async def async_get_data(self) -> list[Any]:
-        data = []
-        data.extend(await self.async_get_ring_configuration())
-        data.append(await self.async_daily_readiness())
-        data.append(await self.async_daily_resilience())
-        data.append(await self.async_daily_sleep())
-        data.append(await self.async_daily_stress())
-        data.append(await self.async_heartrate())
-        # data.append(await self.async_cardiovascular_age())
-        data.append(await self.async_personal_info())
-        data.append(await self.async_activity())
+
+        data = {}
+        errors = []
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                errors.append(result)
+            else:
+                data[name] = result
+
+        if errors and len(errors) == len(results):
+            raise errors[0]
         return data
+
+    async def _async_fetch_endpoint(self, name: str) -> Any:
+        """Fetch one endpoint, bounded by the in-flight cap and its own timeout."""
+        async with self._semaphore:
+            try:
+                async with asyncio.timeout(self._endpoint_timeout) as timeout:
+                    token = _fetch_timeout.set(timeout)
+                    try:
+                        return await self.async_fetch(name)
+                    finally:
+                        _fetch_timeout.reset(token)
+            except TimeoutError:
+                _LOGGER.warning("Timed out fetching %s from Oura API", name)
+                raise
+            except Exception as err:
+                _LOGGER.warning("Failed to fetch %s from Oura API: %s", name, err)
+                raise
     
     async def async_get_ring_configuration(self) -> list[RingConfiguration]:
-        return [RingConfiguration(**{
+        return [RingConfiguration({
             "id": "ring",
             "color": "stealth_black",
             "design": "balance",
@@ -61,101 +386,93 @@ class OuraClient:
             "set_up_at": "2024-11-11",
             "size": 13
         })]
-        data = await self.make_request("GET", f"ring_configuration?start_date={today.strftime('%Y-%m-%d')}&end_date={tomorrow.strftime('%Y-%m-%d')}")
-        try:
-            rings = [RingConfiguration(**a) for a in data['data']]
-        except KeyError:
-            _LOGGER.error("Failed to get ring from Oura API: %s", str(data))
-            _raise_auth_or_response_error(data)
-        return rings
+        return [
+            ring
+            async for ring in self.iter_collection(
+                "ring", RingConfiguration, params=build_date_params()
+            )
+        ]
     
-    async def async_daily_readiness(self) -> DailyReadiness:
-        data = await self.make_request("GET", "daily_readiness", params=build_date_params())
-        try:
-            return DailyReadiness(**data['data'][-1]) 
-        except IndexError:
-            _LOGGER.warning("Failed to get readiness from Oura API: %s", str(data))
-        except KeyError:
-            _LOGGER.error("Failed to get readiness from Oura API: %s", str(data))
-            _raise_auth_or_response_error(data)
-        return None
-    
-    async def async_daily_resilience(self) -> DailyResilience:
-        data = await self.make_request("GET", "daily_resilience", params=build_date_params())
-        try:
-            return DailyResilience(**data['data'][-1])
-        except IndexError:
-            _LOGGER.warning("Failed to get resilience from Oura API: %s", str(data))
-        except KeyError:
-            _LOGGER.error("Failed to get resilience from Oura API: %s", str(data))
-            _raise_auth_or_response_error(data)
-        return None
-    
-    async def async_daily_sleep(self) -> DailySleep:
-        data = await self.make_request("GET", "daily_sleep", params=build_date_params())
-        try:
-            return DailySleep(**data['data'][-1])
-        except IndexError:
-            _LOGGER.warning("Failed to get sleep from Oura API: %s", str(data))
-        except KeyError:
-            _LOGGER.error("Failed to get sleep from Oura API: %s", str(data))
-            _raise_auth_or_response_error(data)
-        return None
-    
-    async def async_daily_stress(self) -> DailyStress:
-        data = await self.make_request("GET", "daily_stress", params=build_date_params())
-        try:
-            return DailyStress(**data['data'][-1])
-        except IndexError:
-            _LOGGER.warning("Failed to get stress from Oura API: %s", str(data))
-        except KeyError:
-            _LOGGER.error("Failed to get stress from Oura API: %s", str(data))
-            _raise_auth_or_response_error(data)
-        return None
-    
-    async def async_heartrate(self) -> HeartRate:
-        data = await self.make_request("GET", "heartrate", params=build_datetime_params())
-        try:
-            return HeartRate(**data['data'][-1])
-        except IndexError:
-            _LOGGER.warning("Failed to get heart rate from Oura API: %s", str(data))
-        except KeyError:
-            _LOGGER.error("Failed to get heart rate from Oura API: %s", str(data))
-            _raise_auth_or_response_error(data)
-        return None
-    
-    async def async_cardiovascular_age(self) -> DailyCardiovascularAge:
-        data = await self.make_request("GET", "daily_cardiovascular_age", params=build_date_params())
-        try:
-            return DailyCardiovascularAge(**data['data'][-1])
-        except IndexError:
-            _LOGGER.warning("Failed to get cardiovascular age from Oura API: %s", str(data))
-        except KeyError:
-            _LOGGER.error("Failed to get cardiovascular age from Oura API: %s", str(data))
-            _raise_auth_or_response_error(data)
-        return None
+    async def async_sleep(self) -> Sleep | None:
+        """Fetch the sleep periods of the last two days.
+
+        Each period's hypnogram, heart rate and HRV are moved into
+        sleep_sessions as compact arrays. Returns the main period of the
+        latest day without them.
+        """
+        sessions = {}
+        records = []
+        async for raw in self.iter_collection("sleep", params=build_date_params()):
+            if raw.get("type") == "deleted":
+                continue
+            session = SleepSession.from_raw(raw)
+            sessions[session.id] = session
+            records.append(raw)
+        self.sleep_sessions = sessions
+
+        periods = main_periods(records)
+        if not periods:
+            _LOGGER.warning("No sleep records from Oura API")
+            return None
+        return Sleep(periods[max(periods)])
     
-    async def async_personal_info(self) -> PersonalInfo:
-        data = await self.make_request("GET", "personal_info")
-        try:
-            return PersonalInfo(**data)
-        except IndexError:
-            _LOGGER.warning("Failed to get personal info from Oura API: %s", str(data))
-        except KeyError:
-            _LOGGER.error("Failed to get personal info from Oura API: %s", str(data))
-            _raise_auth_or_response_error(data)
-        return None
+    async def async_heartrate(self) -> list[HeartRate | HeartRateSummary]:
+        """Append today's new heart-rate samples to the series.
+
+        Only samples newer than the last one stored are requested, from a
+        full ISO datetime just after it, so each poll downloads just what
+        arrived since the previous one and its cost does not grow through
+        the day. Samples are appended as the body streams in rather than
+        after decoding it whole.
+        Returns the latest sample and a summary of the day, reusing the
+        previous objects when nothing new arrived.
+        """
+        today = date.today()
+        params = build_datetime_params(today)
+        series = self.heartrate_series
+        series.start_day(today.isoformat())
+        if series.resume_timestamp is not None:
+            params = {**params, "start_datetime": series.resume_timestamp}
+
+        added = 0
+        async for batch in self.iter_collection("heartrate", params=params).batches():
+            added += series.extend(batch)
+
+        if not len(series):
+            _LOGGER.warning("No heart rate samples from Oura API for %s", series.day)
+            self._heartrate_result = []
+        elif added or not self._heartrate_result:
+            self._heartrate_result = [
+                HeartRate(
+                    bpm=series.last_bpm,
+                    source=series.last_source,
+                    timestamp=series.last_timestamp,
+                ),
+                HeartRateSummary(
+                    day=series.day,
+                    count=len(series),
+                    min=series.min,
+                    max=series.max,
+                    mean=series.mean,
+                    resting=series.resting,
+                    last_timestamp=series.last_timestamp,
+                ),
+            ]
+        return self._heartrate_result
     
-    async def async_activity(self) -> DailyActivity:
-        data = await self.make_request("GET", "daily_activity")
+    async def async_get_document(self, endpoint: str, document_id: str | None = None) -> Any:
+        """Fetch a single document of a collection by id, or a singleton endpoint."""
+        path = ENDPOINTS[endpoint].path
+        if document_id is not None:
+            path = f"{path}/{document_id}"
+        data = await self.make_request("GET", path)
         try:
-            return DailyActivity(**data['data'][-1])
-        except IndexError:
-            _LOGGER.warning("Failed to get activity from Oura API: %s", str(data))
-        except KeyError:
-            _LOGGER.error("Failed to get activity from Oura API: %s", str(data))
+            document = MODELS[endpoint](data)
+            document.validate()
+            return document
+        except ValueError:
+            _LOGGER.error("Failed to get %s from Oura API: %s", path, str(data))
             _raise_auth_or_response_error(data)
-        return None
     
 def build_date_params():
     today = datetime.today()
@@ -166,16 +483,42 @@ def build_date_params():
         "end_date": tomorrow.strftime('%Y-%m-%d')
     }
 
-def build_datetime_params():
-    today = datetime.today()
-    tomorrow = today + timedelta(days=1)
+def build_datetime_params(day: date | None = None):
+    """Return the window from local midnight of a day to the next, as full ISO datetimes."""
+    start = datetime.combine(day or date.today(), time()).astimezone()
+    end = (start + timedelta(days=1)).astimezone()
     return {
-        "start_datetime": today.strftime('%Y-%m-%d'),
-        "end_datetime": tomorrow.strftime('%Y-%m-%d')
+        "start_datetime": start.isoformat(),
+        "end_datetime": end.isoformat()
     }
 
-async def _raise_auth_or_response_error(response: dict[str, Any]) -> None:
-    raise InvalidOuraAPIResponseError
+def collection_params(
+    endpoint: str,
+    start: date | datetime | str | None,
+    end: date | datetime | str | None,
+) -> dict[str, str]:
+    """Return the query window params for a collection, by date or by datetime."""
+    registered = ENDPOINTS.get(endpoint)
+    suffix = "datetime" if registered and registered.params == PARAMS_DATETIME else "date"
+    params = {}
+    if start is not None:
+        params[f"start_{suffix}"] = start if isinstance(start, str) else start.isoformat()
+    if end is not None:
+        params[f"end_{suffix}"] = end if isinstance(end, str) else end.isoformat()
+    return params
+
+def _narrow_params(params: dict[str, str] | None, entry: _CacheEntry) -> dict[str, str] | None:
+    """Start the query window at the last record seen so only newer records come back."""
+    if params is None:
+        return params
+    if "start_datetime" in params and (entry.last_timestamp or "") > params["start_datetime"]:
+        return {**params, "start_datetime": entry.last_timestamp}
+    if "start_date" in params and (entry.last_day or "") > params["start_date"]:
+        return {**params, "start_date": entry.last_day}
+    return params
+
+def _raise_auth_or_response_error(response: dict[str, Any]) -> None:
+    raise InvalidOuraAPIResponseError(response.get("detail") if isinstance(response, dict) else None)
 
 class InvalidOuraAPIResponseError(Exception):
     """Error thrown when the external Oura API returns an invalid response."""
@@ -0,0 +1,99 @@
+"""Registry of the Oura endpoints the integration knows how to fetch.
+
+Adding an endpoint is one entry here plus its model and sensor
+descriptions; the client, the coordinator's refresh schedule and the
+persisted lookup table all follow from the registry.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .models.base import Record
+from .models.daily_activity import DailyActivity
+from .models.daily_cardiovascular_age import DailyCardiovascularAge
+from .models.daily_readiness import DailyReadiness
+from .models.daily_resilience import DailyResilience
+from .models.daily_sleep import DailySleep
+from .models.daily_spo2 import DailySpO2
+from .models.daily_stress import DailyStress
+from .models.enhanced_tag import EnhancedTag
+from .models.heartrate import HeartRate, HeartRateSummary
+from .models.personal_info import PersonalInfo
+from .models.ring_configuration import RingConfiguration
+from .models.session import Session
+from .models.sleep import Sleep
+from .models.vo2_max import VO2Max
+from .models.workout import Workout
+
+# How a collection is queried.
+PARAMS_NONE = "none"
+PARAMS_DATE = "date"
+PARAMS_DATETIME = "datetime"
+
+# How an endpoint is turned into lookup table entries.
+FETCH_LATEST = "latest"  # the newest record of the last two days
+FETCH_DOCUMENT = "document"  # a single object rather than a collection
+FETCH_CUSTOM = "custom"  # a dedicated OuraClient method
+
+# Refresh tiers, mapped to intervals by the integration.
+TIER_LIVE = "live"
+TIER_ARRIVAL = "arrival"  # polled around the learned arrival of the day's record
+TIER_INTRADAY = "intraday"
+TIER_PERIODIC = "periodic"
+TIER_HOURLY = "hourly"
+TIER_DAILY = "daily"
+
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    """How one endpoint is fetched and which lookups it fills."""
+
+    name: str
+    path: str
+    model: type[Record]
+    params: str = PARAMS_DATE
+    fetch: str = FETCH_LATEST
+    tier: str = TIER_HOURLY
+    # Lookups the endpoint fills besides its own name.
+    extra_lookups: tuple[str, ...] = ()
+
+    @property
+    def lookups(self) -> tuple[str, ...]:
+        return (self.name, *self.extra_lookups)
+
+ENDPOINTS: dict[str, Endpoint] = {
+    endpoint.name: endpoint
+    for endpoint in (
+        Endpoint("ring", "ring_configuration", RingConfiguration, fetch=FETCH_CUSTOM, tier=TIER_DAILY),
+        Endpoint("personal_info", "personal_info", PersonalInfo, params=PARAMS_NONE, fetch=FETCH_DOCUMENT, tier=TIER_DAILY),
+        Endpoint("daily_readiness", "daily_readiness", DailyReadiness, tier=TIER_ARRIVAL),
+        Endpoint("daily_resilience", "daily_resilience", DailyResilience, tier=TIER_ARRIVAL),
+        Endpoint("daily_sleep", "daily_sleep", DailySleep, tier=TIER_ARRIVAL),
+        Endpoint("sleep", "sleep", Sleep, fetch=FETCH_CUSTOM, tier=TIER_ARRIVAL),
+        Endpoint("daily_stress", "daily_stress", DailyStress, tier=TIER_PERIODIC),
+        Endpoint("daily_activity", "daily_activity", DailyActivity, params=PARAMS_NONE, tier=TIER_INTRADAY),
+        Endpoint(
+            "heartrate", "heartrate", HeartRate,
+            params=PARAMS_DATETIME, fetch=FETCH_CUSTOM, tier=TIER_LIVE,
+            extra_lookups=("heartrate_summary",),
+        ),
+        Endpoint("daily_cardiovascular_age", "daily_cardiovascular_age", DailyCardiovascularAge, tier=TIER_DAILY),
+        Endpoint("daily_spo2", "daily_spo2", DailySpO2),
+        Endpoint("vo2_max", "vO2_max", VO2Max, tier=TIER_DAILY),
+        Endpoint("workout", "workout", Workout),
+        Endpoint("session", "session", Session),
+        Endpoint("enhanced_tag", "enhanced_tag", EnhancedTag),
+    )
+}
+
+# Model class for each lookup, used to rebuild persisted lookup tables.
+MODELS: dict[str, type[Record]] = {
+    **{name: endpoint.model for name, endpoint in ENDPOINTS.items()},
+    "heartrate_summary": HeartRateSummary,
+}
+
+def endpoint_for_lookup(lookup: str) -> Endpoint | None:
+    """Return the endpoint that fills a lookup."""
+    for endpoint in ENDPOINTS.values():
+        if lookup in endpoint.lookups:
+            return endpoint
+    return None
@@ -0,0 +1,152 @@
+"""Columnar in-memory buffer for a day of heart-rate samples."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from typing import Any
+
+RESTING_SOURCES = ("rest", "sleep")
+
+class HeartRateSeries:
+    """Heart-rate samples for one day, stored as parallel arrays.
+
+    Samples are appended in timestamp order and anything not newer than the
+    last stored sample is ignored, so overlapping polls are safe. Running
+    totals keep min, max, mean and resting bpm O(1) to read.
+    """
+
+    __slots__ = (
+        "_last_timestamp",
+        "_max",
+        "_min",
+        "_resting_count",
+        "_resting_sum",
+        "_source_codes",
+        "_source_names",
+        "_sum",
+        "bpm",
+        "day",
+        "sources",
+        "timestamps",
+    )
+
+    def __init__(self) -> None:
+        self.day: str | None = None
+        self._source_names: list[str] = []
+        self._source_codes: dict[str, int] = {}
+        self.reset()
+
+    def reset(self, day: str | None = None) -> None:
+        """Drop every sample and start collecting for the given day."""
+        self.day = day
+        self.timestamps = array("q")
+        self.bpm = array("H")
+        self.sources = array("B")
+        self._last_timestamp: str | None = None
+        self._sum = 0
+        self._min: int | None = None
+        self._max: int | None = None
+        self._resting_sum = 0
+        self._resting_count = 0
+
+    def start_day(self, day: str) -> None:
+        """Reset the buffer when the day being collected rolls over."""
+        if day != self.day:
+            self.reset(day)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def last_timestamp(self) -> str | None:
+        """ISO timestamp of the newest sample, as returned by the API."""
+        return self._last_timestamp
+
+    @property
+    def resume_timestamp(self) -> str | None:
+        """ISO timestamp just after the newest sample, to ask only for newer ones."""
+        if self._last_timestamp is None:
+            return None
+        return (datetime.fromisoformat(self._last_timestamp) + timedelta(seconds=1)).isoformat()
+
+    def extend(self, samples: Iterable[dict[str, Any]]) -> int:
+        """Append samples newer than the last one stored and return how many were added."""
+        added = 0
+        last = self.timestamps[-1] if self.timestamps else None
+        for sample in samples:
+            timestamp = int(datetime.fromisoformat(sample["timestamp"]).timestamp())
+            if last is not None and timestamp <= last:
+                continue
+            bpm = int(sample["bpm"])
+            source = sample.get("source") or ""
+            self.timestamps.append(timestamp)
+            self.bpm.append(bpm)
+            self.sources.append(self._source_code(source))
+            self._last_timestamp = sample["timestamp"]
+            self._sum += bpm
+            self._min = bpm if self._min is None else min(self._min, bpm)
+            self._max = bpm if self._max is None else max(self._max, bpm)
+            if source in RESTING_SOURCES:
+                self._resting_sum += bpm
+                self._resting_count += 1
+            last = timestamp
+            added += 1
+        return added
+
+    def _source_code(self, source: str) -> int:
+        code = self._source_codes.get(source)
+        if code is None:
+            code = len(self._source_names)
+            self._source_names.append(source)
+            self._source_codes[source] = code
+        return code
+
+    @property
+    def last_bpm(self) -> int | None:
+        return self.bpm[-1] if self.bpm else None
+
+    @property
+    def last_source(self) -> str | None:
+        return self._source_names[self.sources[-1]] if self.sources else None
+
+    @property
+    def min(self) -> int | None:
+        return self._min
+
+    @property
+    def max(self) -> int | None:
+        return self._max
+
+    @property
+    def mean(self) -> float | None:
+        return self._sum / len(self.bpm) if self.bpm else None
+
+    @property
+    def resting(self) -> float | None:
+        """Mean bpm over samples taken at rest or asleep."""
+        if not self._resting_count:
+            return None
+        return self._resting_sum / self._resting_count
+
+    def hourly(self, since: int = 0) -> Iterator[tuple[int, float, int, int]]:
+        """Yield (hour start, mean, min, max) for every hour starting at or after since."""
+        start = bisect_left(self.timestamps, since)
+        hour = None
+        total = count = low = high = 0
+        for index in range(start, len(self.timestamps)):
+            sample_hour = self.timestamps[index] - self.timestamps[index] % 3600
+            bpm = self.bpm[index]
+            if sample_hour != hour:
+                if count:
+                    yield hour, total / count, low, high
+                hour = sample_hour
+                total = count = 0
+                low = high = bpm
+            total += bpm
+            count += 1
+            low = min(low, bpm)
+            high = max(high, bpm)
+        if count:
+            yield hour, total / count, low, high
@@ -0,0 +1,102 @@
+"""Lightweight timing spans for the Oura refresh hot path."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_WINDOW = 100
+
+# Returned by span() while disabled, so a disabled span costs one attribute
+# check and an empty with block.
+_NOOP = nullcontext()
+
+
+class Instrumentation:
+    """Rolling per-endpoint timings and byte counts.
+
+    Spans are recorded per (endpoint, phase), e.g. ("daily_sleep", "request")
+    or ("coordinator", "lookup_table"), keeping the last window durations
+    so p50 and p95 can be read at any time.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = DEFAULT_WINDOW) -> None:
+        self.enabled = enabled
+        self._window = window
+        self._timings: dict[tuple[str, str], deque[float]] = {}
+        self._bytes: dict[str, int] = {}
+
+    def span(self, endpoint: str, phase: str) -> AbstractContextManager[None]:
+        """Time the enclosed block when enabled."""
+        if not self.enabled:
+            return _NOOP
+        return self._span(endpoint, phase)
+
+    @contextmanager
+    def _span(self, endpoint: str, phase: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(endpoint, phase, time.perf_counter() - started)
+
+    def record(self, endpoint: str, phase: str, duration: float) -> None:
+        timings = self._timings.get((endpoint, phase))
+        if timings is None:
+            timings = self._timings[(endpoint, phase)] = deque(maxlen=self._window)
+        timings.append(duration)
+
+    def add_bytes(self, endpoint: str, count: int) -> None:
+        if self.enabled:
+            self._bytes[endpoint] = self._bytes.get(endpoint, 0) + count
+
+    def percentile(self, endpoint: str, phase: str, percent: float) -> float | None:
+        """Return a percentile of the rolling window in seconds."""
+        timings = self._timings.get((endpoint, phase))
+        if not timings:
+            return None
+        ordered = sorted(timings)
+        return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._bytes.values())
+
+    def summary(self) -> dict[str, Any]:
+        """Return p50/p95 per endpoint and phase, in milliseconds, plus bytes received."""
+        result: dict[str, Any] = {}
+        for (endpoint, phase), timings in sorted(self._timings.items()):
+            result.setdefault(endpoint, {})[phase] = {
+                "count": len(timings),
+                "p50_ms": round(self.percentile(endpoint, phase, 50) * 1000, 2),
+                "p95_ms": round(self.percentile(endpoint, phase, 95) * 1000, 2),
+            }
+        for endpoint, count in self._bytes.items():
+            result.setdefault(endpoint, {})["bytes"] = count
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class RefreshTimings:
+    """Refresh timings published to the debug sensors."""
+
+    refresh_p50: float | None
+    refresh_p95: float | None
+    bytes_received: int
+
+    @property
+    def lookup(self):
+        return "instrumentation"
+
+    @classmethod
+    def from_instrumentation(cls, instrumentation: Instrumentation) -> RefreshTimings:
+        p50 = instrumentation.percentile("coordinator", "refresh", 50)
+        p95 = instrumentation.percentile("coordinator", "refresh", 95)
+        return cls(
+            refresh_p50=round(p50 * 1000, 1) if p50 is not None else None,
+            refresh_p95=round(p95 * 1000, 1) if p95 is not None else None,
+            bytes_received=instrumentation.total_bytes,
+        )
@@ -0,0 +1,124 @@
+"""Lightweight records decoded lazily from Oura API payloads.
+
+A record keeps the raw JSON object it was built from and validates a
+field only when it is read, so fields no sensor uses are never converted.
+"""
+from __future__ import annotations
+
+from typing import Any, ClassVar
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    from json import loads as json_loads
+
+__all__ = ["Field", "InvalidRecordError", "Record", "json_loads"]
+
+
+class InvalidRecordError(ValueError):
+    """Error thrown when a record field is missing or has the wrong type."""
+
+
+class Field:
+    """Descriptor reading and validating one key of a record's raw object."""
+
+    __slots__ = ("name", "nested", "optional", "type")
+
+    def __init__(self, type_: type, optional: bool = False) -> None:
+        self.name = ""
+        self.type = type_
+        self.optional = optional
+        self.nested = isinstance(type_, type) and issubclass(type_, Record)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Record | None, owner: type) -> Any:
+        if instance is None:
+            return self
+        value = instance._raw.get(self.name)
+        if value is None:
+            if self.optional:
+                return None
+            raise InvalidRecordError(f"{owner.__name__}.{self.name} is missing")
+        if self.nested:
+            return self.type(value)
+        return self._coerce(owner, value)
+
+    def _coerce(self, owner: type, value: Any) -> Any:
+        expected = self.type
+        kind = type(value)
+        if kind is expected:
+            return value
+        if expected is float and kind is int:
+            return float(value)
+        if expected is int and kind is float and value.is_integer():
+            return int(value)
+        raise InvalidRecordError(
+            f"{owner.__name__}.{self.name} should be {expected.__name__}, got {kind.__name__}"
+        )
+
+    def dump(self, value: Any) -> Any:
+        """Strip a raw value down to the declared fields."""
+        if self.nested and isinstance(value, dict):
+            return self.type(value).as_dict()
+        return value
+
+
+class _RecordMeta(type):
+    def __new__(mcs, name, bases, namespace):
+        # Records never need an instance __dict__.
+        namespace.setdefault("__slots__", ())
+        cls = super().__new__(mcs, name, bases, namespace)
+        fields = {}
+        for base in reversed(cls.__mro__):
+            for attr, value in vars(base).items():
+                if isinstance(value, Field):
+                    fields[attr] = value
+        cls._fields = fields
+        return cls
+
+
+class Record(metaclass=_RecordMeta):
+    """Base class of every Oura model."""
+
+    __slots__ = ("_raw",)
+    _fields: ClassVar[dict[str, Field]]
+
+    def __init__(self, raw: dict[str, Any] | None = None, /, **fields: Any) -> None:
+        if raw is None:
+            raw = fields
+        elif not isinstance(raw, dict):
+            raise InvalidRecordError(
+                f"{type(self).__name__} expects an object, got {type(raw).__name__}"
+            )
+        self._raw = raw
+
+    def validate(self) -> None:
+        """Read every field once, raising InvalidRecordError on the first bad one."""
+        for name, field in self._fields.items():
+            value = getattr(self, name)
+            if field.nested and value is not None:
+                value.validate()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the declared fields as plain JSON values."""
+        raw = self._raw
+        return {
+            name: field.dump(raw[name])
+            for name, field in self._fields.items()
+            if name in raw
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._raw == other._raw
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={self._raw.get(name)!r}" for name in self._fields
+        )
+        return f"{type(self).__name__}({fields})"
@@ -1,38 +1,38 @@
-from pydantic import BaseModel
+from .base import Field, Record
 
-class DailyActivityContributors(BaseModel):
-    meet_daily_targets: int
-    move_every_hour: int
-    recovery_time: int
-    stay_active: int
-    training_frequency: int
-    training_volume: int
+class DailyActivityContributors(Record):
+    meet_daily_targets = Field(int)
+    move_every_hour = Field(int)
+    recovery_time = Field(int)
+    stay_active = Field(int)
+    training_frequency = Field(int)
+    training_volume = Field(int)
 
-class DailyActivity(BaseModel):
-    id: str
-    score: int
-    active_calories: int
-    average_met_minutes: float
-    contributors: DailyActivityContributors
-    equivalent_walking_distance: int
-    high_activity_met_minutes: int
-    high_activity_time: int
-    inactivity_alerts: int
-    low_activity_met_minutes: int
-    low_activity_time: int
-    medium_activity_met_minutes: int
-    medium_activity_time: int
-    meters_to_target: int
-    non_wear_time: int
-    resting_time: int
-    sedentary_met_minutes: int
-    sedentary_time: int
-    steps: int
-    target_calories: int
-    target_meters: int
-    total_calories: int
-    day: str
-    timestamp: str
+class DailyActivity(Record):
+    id = Field(str)
+    score = Field(int)
+    active_calories = Field(int)
+    average_met_minutes = Field(float)
+    contributors = Field(DailyActivityContributors)
+    equivalent_walking_distance = Field(int)
+    high_activity_met_minutes = Field(int)
+    high_activity_time = Field(int)
+    inactivity_alerts = Field(int)
+    low_activity_met_minutes = Field(int)
+    low_activity_time = Field(int)
+    medium_activity_met_minutes = Field(int)
+    medium_activity_time = Field(int)
+    meters_to_target = Field(int)
+    non_wear_time = Field(int)
+    resting_time = Field(int)
+    sedentary_met_minutes = Field(int)
+    sedentary_time = Field(int)
+    steps = Field(int)
+    target_calories = Field(int)
+    target_meters = Field(int)
+    total_calories = Field(int)
+    day = Field(str)
+    timestamp = Field(str)
 
     @property
     def lookup(self):
@@ -1,8 +1,8 @@
-from pydantic import BaseModel
+from .base import Field, Record
 
-class DailyCardiovascularAge(BaseModel):
-    day: str
-    vascular_age: int
+class DailyCardiovascularAge(Record):
+    day = Field(str)
+    vascular_age = Field(int)
 
     @property
     def lookup(self):
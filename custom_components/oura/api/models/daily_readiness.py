@@ -1,23 +1,23 @@
-from pydantic import BaseModel
+from .base import Field, Record
 
-class ReadinessContributors(BaseModel):
-    activity_balance: int
-    body_temperature: int
-    hrv_balance: int
-    previous_day_activity: int
-    previous_night: int
-    recovery_index: int
-    resting_heart_rate: int
-    sleep_balance: int
+class ReadinessContributors(Record):
+    activity_balance = Field(int)
+    body_temperature = Field(int)
+    hrv_balance = Field(int)
+    previous_day_activity = Field(int)
+    previous_night = Field(int)
+    recovery_index = Field(int)
+    resting_heart_rate = Field(int)
+    sleep_balance = Field(int)
 
-class DailyReadiness(BaseModel):
-    id: str
-    day: str
-    score: int
-    temperature_deviation: float
-    temperature_trend_deviation: float
-    timestamp: str
-    contributors: ReadinessContributors
+class DailyReadiness(Record):
+    id = Field(str)
+    day = Field(str)
+    score = Field(int)
+    temperature_deviation = Field(float)
+    temperature_trend_deviation = Field(float)
+    timestamp = Field(str)
+    contributors = Field(ReadinessContributors)
 
     @property
     def lookup(self):
@@ -1,15 +1,15 @@
-from pydantic import BaseModel
+from .base import Field, Record
 
-class DailyResilienceContributors(BaseModel):
-    sleep_recovery: float
-    daytime_recovery: float
-    stress: float
+class DailyResilienceContributors(Record):
+    sleep_recovery = Field(float)
+    daytime_recovery = Field(float)
+    stress = Field(float)
 
-class DailyResilience(BaseModel):
-    id: str
-    day: str
-    level: str
-    contributors: DailyResilienceContributors
+class DailyResilience(Record):
+    id = Field(str)
+    day = Field(str)
+    level = Field(str)
+    contributors = Field(DailyResilienceContributors)
 
     @property
     def lookup(self):
@@ -1,20 +1,20 @@
-from pydantic import BaseModel
+from .base import Field, Record
 
-class DailySleepContributors(BaseModel):
-    deep_sleep: int
-    efficiency: int
-    latency: int
-    rem_sleep: int
-    restfulness: int
-    timing: int
-    total_sleep: int
+class DailySleepContributors(Record):
+    deep_sleep = Field(int)
+    efficiency = Field(int)
+    latency = Field(int)
+    rem_sleep = Field(int)
+    restfulness = Field(int)
+    timing = Field(int)
+    total_sleep = Field(int)
 
-class DailySleep(BaseModel):
-    id: str
-    day: str
-    score: int
-    timestamp: str
-    contributors: DailySleepContributors
+class DailySleep(Record):
+    id = Field(str)
+    day = Field(str)
+    score = Field(int)
+    timestamp = Field(str)
+    contributors = Field(DailySleepContributors)
 
     @property
     def lookup(self):
@@ -0,0 +1,15 @@
+from .base import Field, Record
+
+
+class SpO2Percentage(Record):
+    average = Field(float)
+
+class DailySpO2(Record):
+    id = Field(str)
+    day = Field(str)
+    spo2_percentage = Field(SpO2Percentage, optional=True)
+    breathing_disturbance_index = Field(int, optional=True)
+
+    @property
+    def lookup(self):
+        return "daily_spo2"
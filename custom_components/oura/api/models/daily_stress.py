@@ -1,11 +1,11 @@
-from pydantic import BaseModel
+from .base import Field, Record
 
-class DailyStress(BaseModel):
-    id: str
-    stress_high: int
-    recovery_high: int
-    day: str
-    day_summary: str | None
+class DailyStress(Record):
+    id = Field(str)
+    stress_high = Field(int)
+    recovery_high = Field(int)
+    day = Field(str)
+    day_summary = Field(str, optional=True)
 
     @property
     def lookup(self):
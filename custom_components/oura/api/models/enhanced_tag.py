@@ -0,0 +1,16 @@
+from .base import Field, Record
+
+
+class EnhancedTag(Record):
+    id = Field(str)
+    start_day = Field(str)
+    start_time = Field(str)
+    end_day = Field(str, optional=True)
+    end_time = Field(str, optional=True)
+    tag_type_code = Field(str, optional=True)
+    custom_name = Field(str, optional=True)
+    comment = Field(str, optional=True)
+
+    @property
+    def lookup(self):
+        return "enhanced_tag"
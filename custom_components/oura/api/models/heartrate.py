@@ -1,10 +1,23 @@
-from pydantic import BaseModel
+from .base import Field, Record
 
-class HeartRate(BaseModel):
-    bpm: int
-    source: str
-    timestamp: str
+class HeartRate(Record):
+    bpm = Field(int)
+    source = Field(str)
+    timestamp = Field(str)
 
     @property
     def lookup(self):
-        return "heartrate"
\ No newline at end of file
+        return "heartrate"
+
+class HeartRateSummary(Record):
+    day = Field(str)
+    count = Field(int)
+    min = Field(int)
+    max = Field(int)
+    mean = Field(float)
+    resting = Field(float, optional=True)
+    last_timestamp = Field(str)
+
+    @property
+    def lookup(self):
+        return "heartrate_summary"
@@ -1,11 +1,11 @@
-from pydantic import BaseModel
+from .base import Field, Record
 
-class PersonalInfo(BaseModel):
-    id: str
-    age: int
-    weight: float
-    height: float
-    biological_sex: str
+class PersonalInfo(Record):
+    id = Field(str)
+    age = Field(int)
+    weight = Field(float)
+    height = Field(float)
+    biological_sex = Field(str)
 
     @property
     def lookup(self):
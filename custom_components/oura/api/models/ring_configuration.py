@@ -1,13 +1,13 @@
-from pydantic import BaseModel
+from .base import Field, Record
 
-class RingConfiguration(BaseModel):
-    id: str
-    color: str
-    design: str
-    firmware_version: str
-    hardware_type: str
-    set_up_at: str
-    size: int
+class RingConfiguration(Record):
+    id = Field(str)
+    color = Field(str)
+    design = Field(str)
+    firmware_version = Field(str)
+    hardware_type = Field(str)
+    set_up_at = Field(str)
+    size = Field(int)
 
     @property
     def lookup(self):
@@ -0,0 +1,14 @@
+from .base import Field, Record
+
+
+class Session(Record):
+    id = Field(str)
+    day = Field(str)
+    type = Field(str)
+    start_datetime = Field(str)
+    end_datetime = Field(str)
+    mood = Field(str, optional=True)
+
+    @property
+    def lookup(self):
+        return "session"
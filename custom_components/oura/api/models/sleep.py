@@ -0,0 +1,30 @@
+from .base import Field, Record
+
+
+class Sleep(Record):
+    """A sleep period without its hypnogram and time series.
+
+    Those are kept as compact arrays in a SleepSession instead.
+    """
+
+    id = Field(str)
+    day = Field(str)
+    type = Field(str)
+    bedtime_start = Field(str)
+    bedtime_end = Field(str)
+    time_in_bed = Field(int)
+    total_sleep_duration = Field(int, optional=True)
+    deep_sleep_duration = Field(int, optional=True)
+    rem_sleep_duration = Field(int, optional=True)
+    light_sleep_duration = Field(int, optional=True)
+    awake_time = Field(int, optional=True)
+    efficiency = Field(int, optional=True)
+    latency = Field(int, optional=True)
+    average_breath = Field(float, optional=True)
+    average_heart_rate = Field(float, optional=True)
+    average_hrv = Field(float, optional=True)
+    lowest_heart_rate = Field(int, optional=True)
+
+    @property
+    def lookup(self):
+        return "sleep"
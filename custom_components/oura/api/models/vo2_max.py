@@ -0,0 +1,12 @@
+from .base import Field, Record
+
+
+class VO2Max(Record):
+    id = Field(str)
+    day = Field(str)
+    timestamp = Field(str)
+    vo2_max = Field(float, optional=True)
+
+    @property
+    def lookup(self):
+        return "vo2_max"
@@ -0,0 +1,18 @@
+from .base import Field, Record
+
+
+class Workout(Record):
+    id = Field(str)
+    day = Field(str)
+    activity = Field(str)
+    intensity = Field(str)
+    source = Field(str)
+    start_datetime = Field(str)
+    end_datetime = Field(str)
+    calories = Field(float, optional=True)
+    distance = Field(float, optional=True)
+    label = Field(str, optional=True)
+
+    @property
+    def lookup(self):
+        return "workout"
@@ -0,0 +1,253 @@
+"""Rate-limited request scheduling for the Oura API."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import ClientError, ClientResponse
+
+_LOGGER = logging.getLogger(__name__)
+
+# Oura allows 5000 requests per 5 minutes per access token.
+DEFAULT_RATE_LIMIT = 5000
+DEFAULT_RATE_PERIOD = 300.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 30.0
+DEFAULT_MAX_WAIT = 10.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 120.0
+
+
+class OuraRequestError(Exception):
+    """Error thrown when a request could not be completed."""
+
+
+class OuraRateLimitError(OuraRequestError):
+    """Error thrown when the API is rate limiting us for longer than we will wait."""
+
+
+class OuraServiceUnavailableError(OuraRequestError):
+    """Error thrown when the API keeps failing with transient errors."""
+
+
+class OuraCircuitOpenError(OuraRequestError):
+    """Error thrown while requests are suspended after repeated failures."""
+
+
+class RequestScheduler:
+    """Token bucket with retries, backoff and a circuit breaker.
+
+    Every request takes a token from a bucket sized to Oura's rate limit.
+    A 429 pauses the bucket for the Retry-After period, and 5xx responses
+    or connection errors are retried with jittered exponential backoff.
+    After enough consecutive failures the circuit opens and requests fail
+    fast until the cooldown has passed.
+
+    Callers usually run requests under a timeout shorter than the longest
+    backoff and rate-limit wait. Passing that timeout to ``async_run`` keeps
+    the scheduler from starting a wait the timeout would cut short: the
+    request fails with the error that caused the wait instead of being
+    cancelled in the middle of it.
+    """
+
+    def __init__(
+        self,
+        rate: int = DEFAULT_RATE_LIMIT,
+        period: float = DEFAULT_RATE_PERIOD,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        breaker_threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        breaker_cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._capacity = float(rate)
+        self._refill_rate = rate / period
+        self._max_retries = max_retries
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._max_wait = max_wait
+        self._breaker_threshold = breaker_threshold
+        self._breaker_cooldown = breaker_cooldown
+        self._clock = clock
+
+        self._tokens = self._capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.requests = 0
+        self.retries = 0
+        self.throttle_events = 0
+        self.circuit_trips = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    @property
+    def circuit_open(self) -> bool:
+        return self._clock() < self._open_until
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return counters describing the scheduler's recent behaviour."""
+        now = self._clock()
+        return {
+            "tokens": round(self._refill(now), 1),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttle_events": self.throttle_events,
+            "total_wait": round(self.total_wait, 3),
+            "max_wait": round(self.max_wait_seen, 3),
+            "paused_for": round(max(0.0, self._paused_until - now), 1),
+            "circuit_open": self.circuit_open,
+            "circuit_trips": self.circuit_trips,
+            "consecutive_failures": self._consecutive_failures,
+        }
+
+    def _refill(self, now: float) -> float:
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._refill_rate
+        )
+        self._updated = now
+        return self._tokens
+
+    async def _async_acquire(self, deadline: float | None = None) -> None:
+        """Wait for a token, or raise if the wait would be too long."""
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        started = self._clock()
+        wait_until = started + self._max_wait
+        if deadline is not None:
+            wait_until = min(wait_until, deadline)
+        try:
+            async with self._lock:
+                while True:
+                    now = self._clock()
+                    wait = self._paused_until - now
+                    if wait <= 0:
+                        if self._refill(now) >= 1:
+                            self._tokens -= 1
+                            break
+                        wait = (1 - self._tokens) / self._refill_rate
+                    if now + wait > wait_until:
+                        raise OuraRateLimitError(
+                            f"Oura API rate limit reached, retry in {wait:.0f}s"
+                        )
+                    self.throttle_events += 1
+                    await asyncio.sleep(wait)
+        finally:
+            self.queue_depth -= 1
+            waited = self._clock() - started
+            self.total_wait += waited
+            self.max_wait_seen = max(self.max_wait_seen, waited)
+
+    async def async_run(
+        self,
+        send: Callable[[], Awaitable[ClientResponse]],
+        timeout: float | None = None,
+    ) -> ClientResponse:
+        """Send a request through the bucket, retrying transient failures.
+
+        ``timeout`` is how long the caller will wait for the request. No
+        backoff or rate-limit wait that would outlast it is started.
+        """
+        if self.circuit_open:
+            raise OuraCircuitOpenError("Oura API requests are suspended after repeated failures")
+
+        deadline = self._clock() + timeout if timeout is not None else None
+        error: Exception | None = None
+        for attempt in range(self._max_retries + 1):
+            if attempt:
+                backoff = self._backoff(attempt)
+                if deadline is not None and self._clock() + backoff >= deadline:
+                    break
+                self.retries += 1
+                await asyncio.sleep(backoff)
+
+            try:
+                await self._async_acquire(deadline)
+            except OuraRateLimitError as err:
+                # The budget may have refilled by the next attempt.
+                error = err
+                continue
+            self.requests += 1
+            try:
+                response = await send()
+            except (ClientError, TimeoutError) as err:
+                error = err
+                continue
+
+            if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                response.release()
+                self.throttle_events += 1
+                self._paused_until = max(
+                    self._paused_until,
+                    self._clock() + (retry_after if retry_after is not None else self._backoff(attempt + 1)),
+                )
+                _LOGGER.debug("Oura API rate limited, retry after %s", retry_after)
+                error = OuraRateLimitError("Oura API rate limit reached")
+                continue
+
+            if response.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                response.release()
+                error = OuraServiceUnavailableError(
+                    f"Oura API returned {response.status}"
+                )
+                continue
+
+            self._consecutive_failures = 0
+            return response
+
+        self._record_failure()
+        if isinstance(error, OuraRequestError):
+            raise error
+        raise OuraServiceUnavailableError(str(error)) from error
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self._max_backoff, self._base_backoff * 2 ** attempt))
+
+    def _record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self._breaker_threshold:
+            if not self.circuit_open:
+                self.circuit_trips += 1
+                _LOGGER.warning(
+                    "Suspending Oura API requests for %ss after %s consecutive failures",
+                    self._breaker_cooldown,
+                    self._consecutive_failures,
+                )
+            self._open_until = self._clock() + self._breaker_cooldown
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
@@ -0,0 +1,156 @@
+"""Compact buffers for the hypnogram and time series of a sleep period."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+PHASE_INTERVAL = 300
+PHASE_DEEP = 1
+PHASE_LIGHT = 2
+PHASE_REM = 3
+PHASE_AWAKE = 4
+
+# sleep_phase_5_min is a string of digits, one per 5-minute epoch.
+_PHASE_CODES = bytes.maketrans(b"1234", bytes((PHASE_DEEP, PHASE_LIGHT, PHASE_REM, PHASE_AWAKE)))
+
+# Duration fields of a sleep record and the phase each one counts.
+_PHASE_FIELDS = {
+    "deep_sleep_duration": PHASE_DEEP,
+    "light_sleep_duration": PHASE_LIGHT,
+    "rem_sleep_duration": PHASE_REM,
+    "awake_time": PHASE_AWAKE,
+}
+
+class SleepSeries:
+    """Samples taken at a fixed interval, with 0 marking a missing sample."""
+
+    __slots__ = ("interval", "start", "values")
+
+    def __init__(self, start: int, interval: int, values: array) -> None:
+        self.start = start
+        self.interval = interval
+        self.values = values
+
+    @classmethod
+    def from_raw(cls, raw: dict[str, Any] | None) -> SleepSeries | None:
+        if not raw or not raw.get("items"):
+            return None
+        return cls(
+            _epoch(raw["timestamp"]),
+            int(raw["interval"]),
+            array("H", (0 if item is None else round(item) for item in raw["items"])),
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def hourly(self) -> Iterator[tuple[int, float, int, int]]:
+        """Yield (hour start, mean, min, max) for every hour with samples."""
+        hour = None
+        total = count = low = high = 0
+        for index, value in enumerate(self.values):
+            if not value:
+                continue
+            timestamp = self.start + index * self.interval
+            sample_hour = timestamp - timestamp % 3600
+            if sample_hour != hour:
+                if count:
+                    yield hour, total / count, low, high
+                hour = sample_hour
+                total = count = 0
+                low = high = value
+            total += value
+            count += 1
+            low = min(low, value)
+            high = max(high, value)
+        if count:
+            yield hour, total / count, low, high
+
+class SleepSession:
+    """The hypnogram, heart rate and HRV of one sleep period.
+
+    The hypnogram is one byte per 5-minute epoch holding a PHASE_* code,
+    and the series are unsigned 16-bit arrays, so a night costs a few
+    hundred bytes rather than a Python object per epoch.
+    """
+
+    __slots__ = ("day", "end", "heart_rate", "hrv", "hypnogram", "id", "start")
+
+    def __init__(
+        self,
+        id: str,
+        day: str,
+        start: int,
+        end: int,
+        hypnogram: bytes,
+        heart_rate: SleepSeries | None,
+        hrv: SleepSeries | None,
+    ) -> None:
+        self.id = id
+        self.day = day
+        self.start = start
+        self.end = end
+        self.hypnogram = hypnogram
+        self.heart_rate = heart_rate
+        self.hrv = hrv
+
+    @classmethod
+    def from_raw(cls, raw: dict[str, Any]) -> SleepSession:
+        """Build a session from a raw sleep record, moving its series out of it.
+
+        Duration fields the record leaves empty are filled in from the
+        hypnogram.
+        """
+        phases = raw.pop("sleep_phase_5_min", None) or ""
+        heart_rate = raw.pop("heart_rate", None)
+        hrv = raw.pop("hrv", None)
+        raw.pop("movement_30_sec", None)
+        session = cls(
+            raw["id"],
+            raw["day"],
+            _epoch(raw["bedtime_start"]),
+            _epoch(raw["bedtime_end"]),
+            phases.encode("ascii").translate(_PHASE_CODES),
+            SleepSeries.from_raw(heart_rate),
+            SleepSeries.from_raw(hrv),
+        )
+        session._fill_durations(raw)
+        return session
+
+    @property
+    def key(self) -> tuple[str, int]:
+        """Identifies this version of the period; Oura can extend a period after a late sync."""
+        return self.id, self.end
+
+    def phase_seconds(self, phase: int) -> int:
+        """Return the time spent in a PHASE_* according to the hypnogram."""
+        return self.hypnogram.count(phase) * PHASE_INTERVAL
+
+    def _fill_durations(self, raw: dict[str, Any]) -> None:
+        if not self.hypnogram:
+            return
+        for field, phase in _PHASE_FIELDS.items():
+            if raw.get(field) is None:
+                raw[field] = self.phase_seconds(phase)
+        if raw.get("total_sleep_duration") is None:
+            raw["total_sleep_duration"] = sum(
+                raw[field] for field in ("deep_sleep_duration", "light_sleep_duration", "rem_sleep_duration")
+            )
+
+def main_periods(records: Iterable[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Return the longest non-deleted sleep period of each day, keyed by day."""
+    periods: dict[str, dict[str, Any]] = {}
+    for record in records:
+        if record.get("type") == "deleted":
+            continue
+        current = periods.get(record["day"])
+        if current is None or (record.get("total_sleep_duration") or 0) > (
+            current.get("total_sleep_duration") or 0
+        ):
+            periods[record["day"]] = record
+    return periods
+
+def _epoch(timestamp: str) -> int:
+    return int(datetime.fromisoformat(timestamp).timestamp())
@@ -0,0 +1,138 @@
+"""Incremental splitting of Oura collection responses into records."""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from .models.base import json_loads
+
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*'
+# A string (closed, or cut off at the end of the buffer) or a bracket.
+_TOKEN = re.compile(rb"(" + _STRING + rb')("?)|[{}\[\]]', re.DOTALL)
+# A whole record with no nested objects or arrays, matched in one step.
+_FLAT_RECORD = re.compile(rb'\{(?:[^{}\[\]"]++|' + _STRING + rb'")*+\}', re.DOTALL)
+
+_OPEN_BRACE = 0x7B
+_CLOSE_BRACE = 0x7D
+_OPEN_BRACKET = 0x5B
+
+_ENVELOPE = 0
+_ARRAY = 1
+
+class RecordStream:
+    """Split a collection body into the raw bytes of each record as it arrives.
+
+    Chunks are fed in as they are read from the socket and every object of
+    the top-level ``data`` array is returned as soon as its closing brace
+    has been seen. Only the record being read is buffered, so memory does
+    not grow with the size of the response. Everything outside the array,
+    such as ``next_token`` or an error ``detail``, is kept and returned by
+    ``close`` with ``data`` emptied.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_depth",
+        "_envelope",
+        "_key",
+        "_last_string",
+        "_mark",
+        "_pos",
+        "_record_start",
+        "_state",
+    )
+
+    def __init__(self, key: str = "data") -> None:
+        self._key = key.encode()
+        self._buffer = bytearray()
+        self._envelope = bytearray()
+        self._pos = 0
+        # Start of the bytes not yet copied to the envelope or a record.
+        self._mark = 0
+        self._depth = 0
+        self._state = _ENVELOPE
+        self._last_string: bytes | None = None
+        self._record_start: int | None = None
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add a chunk of the body and return the records it completed."""
+        buffer = self._buffer
+        buffer += chunk
+        pos = self._pos
+        records = []
+
+        while True:
+            match = _TOKEN.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.start()
+
+            if match.group(1) is not None:
+                if not match.group(2):
+                    # Cut off mid-string; scan it again once the rest arrives.
+                    break
+                # Only keys of the outer object matter for finding the array.
+                if self._state == _ENVELOPE and self._depth == 1:
+                    self._last_string = match.group(1)[1:]
+                pos = match.end()
+                continue
+
+            char = buffer[pos]
+            if char == _OPEN_BRACE or char == _OPEN_BRACKET:
+                if self._state == _ENVELOPE:
+                    if char == _OPEN_BRACKET and self._depth == 1 and self._last_string == self._key:
+                        self._envelope += buffer[self._mark:pos + 1]
+                        self._mark = pos + 1
+                        self._state = _ARRAY
+                elif self._depth == 2 and char == _OPEN_BRACE:
+                    flat = _FLAT_RECORD.match(buffer, pos)
+                    if flat is not None:
+                        records.append(bytes(flat.group()))
+                        pos = self._mark = flat.end()
+                        continue
+                    self._record_start = pos
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._state == _ARRAY:
+                    if self._depth == 2 and self._record_start is not None:
+                        records.append(bytes(buffer[self._record_start:pos + 1]))
+                        self._record_start = None
+                        self._mark = pos + 1
+                    elif self._depth == 1:
+                        # The closing bracket goes back into the envelope.
+                        self._mark = pos
+                        self._state = _ENVELOPE
+            pos += 1
+
+        self._pos = pos
+        self._compact()
+        return records
+
+    def _compact(self) -> None:
+        """Drop the bytes that have been consumed from the buffer."""
+        if self._state == _ARRAY:
+            cut = self._record_start if self._record_start is not None else self._pos
+        else:
+            cut = self._pos
+            self._envelope += self._buffer[self._mark:cut]
+        if not cut:
+            return
+
+        del self._buffer[:cut]
+        self._pos -= cut
+        self._mark = 0
+        if self._record_start is not None:
+            self._record_start -= cut
+
+    def close(self) -> Any:
+        """Return the decoded body with the records left out.
+
+        Raises ValueError when the body was cut off or is not valid JSON.
+        """
+        if self._state == _ARRAY or self._depth:
+            raise ValueError("Response body ended in the middle of a record")
+        self._envelope += self._buffer[self._mark:]
+        self._buffer.clear()
+        return json_loads(bytes(self._envelope))
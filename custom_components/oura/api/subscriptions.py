@@ -0,0 +1,88 @@
+"""Client for Oura webhook subscriptions."""
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+from typing import Any
+
+from .client import InvalidOuraAPIResponseError
+from .scheduler import RequestScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OuraSubscriptionClient:
+    """Manages webhook subscriptions for an Oura API application.
+
+    Subscriptions belong to the application rather than a user, so requests
+    are authenticated with the application's client id and secret.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        session,
+        client_id: str,
+        client_secret: str,
+        scheduler: RequestScheduler | None = None,
+    ):
+        self._host = host
+        self._session = session
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self.scheduler = scheduler or RequestScheduler()
+
+    async def _async_request(self, method: str, url: str = "", **kwargs) -> Any:
+        headers = {
+            "x-client-id": self._client_id,
+            "x-client-secret": self._client_secret,
+        }
+        response = await self.scheduler.async_run(
+            lambda: self._session.request(
+                method, f"{self._host}{url}", headers=headers, **kwargs,
+            )
+        )
+        if response.status == HTTPStatus.NO_CONTENT:
+            response.release()
+            return None
+        try:
+            data = await response.json(content_type=None)
+        except ValueError as err:
+            _LOGGER.error("Failed to decode Oura webhook response: %s", err)
+            raise InvalidOuraAPIResponseError(str(err)) from err
+        if response.status >= HTTPStatus.BAD_REQUEST:
+            _LOGGER.error("Oura webhook request failed: %s", str(data))
+            raise InvalidOuraAPIResponseError(
+                data.get("detail") if isinstance(data, dict) else None
+            )
+        return data
+
+    async def async_list(self) -> list[dict[str, Any]]:
+        """Return every subscription of the application."""
+        return await self._async_request("GET") or []
+
+    async def async_create(
+        self,
+        callback_url: str,
+        verification_token: str,
+        event_type: str,
+        data_type: str,
+    ) -> dict[str, Any]:
+        """Create a subscription. Oura verifies the callback before it returns."""
+        return await self._async_request(
+            "POST",
+            json={
+                "callback_url": callback_url,
+                "verification_token": verification_token,
+                "event_type": event_type,
+                "data_type": data_type,
+            },
+        )
+
+    async def async_renew(self, subscription_id: str) -> dict[str, Any]:
+        """Extend a subscription's expiration time."""
+        return await self._async_request("PUT", f"/renew/{subscription_id}")
+
+    async def async_delete(self, subscription_id: str) -> None:
+        """Delete a subscription."""
+        await self._async_request("DELETE", f"/{subscription_id}")
@@ -0,0 +1,70 @@
+"""Learned arrival times of the daily Oura records."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from datetime import timedelta
+from statistics import median
+
+from .const import (
+    ARRIVAL_BACKOFF,
+    ARRIVAL_DEFAULT_WINDOW,
+    ARRIVAL_MIN_SPREAD,
+    ARRIVAL_SAMPLES,
+)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class ArrivalWindows:
+    """When in the day each endpoint's record for the day usually shows up.
+
+    Arrival times are kept as minutes after local midnight for the last
+    few days. The window is their median widened by their spread, and
+    polling is fast inside it, slow after it and stops for the rest of the
+    day once the day's record is in.
+    """
+
+    def __init__(self, samples: Mapping[str, Iterable[int]] | None = None) -> None:
+        self._samples: dict[str, deque[int]] = {}
+        self._windows: dict[str, tuple[int, int]] = {}
+        for endpoint, minutes in (samples or {}).items():
+            for minute in minutes:
+                self.add(endpoint, minute)
+
+    def add(self, endpoint: str, minute: int) -> None:
+        """Record that an endpoint's record for the day arrived at this minute."""
+        samples = self._samples.setdefault(endpoint, deque(maxlen=ARRIVAL_SAMPLES))
+        samples.append(int(minute) % MINUTES_PER_DAY)
+
+        middle = median(samples)
+        deviation = median(abs(sample - middle) for sample in samples)
+        spread = max(ARRIVAL_MIN_SPREAD.total_seconds() / 60, 2 * deviation)
+        self._windows[endpoint] = (
+            int(max(0, middle - spread)),
+            int(min(MINUTES_PER_DAY, middle + spread)),
+        )
+
+    def window(self, endpoint: str) -> tuple[int, int]:
+        """Return the start and end of the arrival window in minutes after midnight."""
+        return self._windows.get(endpoint, ARRIVAL_DEFAULT_WINDOW)
+
+    def next_poll(self, endpoint: str, minute: int, arrived: bool, interval: timedelta) -> timedelta:
+        """Return how long to wait before polling an endpoint again.
+
+        ``minute`` is the current time in minutes after local midnight and
+        ``interval`` the poll interval inside the window.
+        """
+        start, end = self.window(endpoint)
+        if arrived:
+            wait = timedelta(minutes=MINUTES_PER_DAY - minute + start)
+        elif minute < start:
+            wait = timedelta(minutes=start - minute)
+        elif minute <= end:
+            wait = interval
+        else:
+            wait = ARRIVAL_BACKOFF
+        return max(wait, interval)
+
+    def as_dict(self) -> dict[str, list[int]]:
+        return {endpoint: list(samples) for endpoint, samples in self._samples.items()}
@@ -0,0 +1,149 @@
+"""Historical backfill of Oura data into long-term statistics."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .api.client import OuraClient
+from .api.heartrate_series import HeartRateSeries
+from .api.sleep_session import SleepSession, main_periods
+from .const import (
+    BACKFILL_CHUNK_DAYS,
+    BACKFILL_CONCURRENCY,
+    BACKFILL_HEARTRATE_CHUNK_DAYS,
+    DOMAIN,
+    STORAGE_VERSION,
+)
+from .statistics import (
+    DAILY_STATISTICS,
+    async_import_daily_statistics,
+    async_import_heartrate_statistics,
+    async_import_sleep_statistics,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+BACKFILL_ENDPOINTS = (
+    "daily_sleep",
+    "sleep",
+    "daily_readiness",
+    "daily_activity",
+    "daily_stress",
+    "daily_resilience",
+    "heartrate",
+)
+
+
+class OuraBackfill:
+    """Walks the daily endpoints over a date range and writes statistics.
+
+    The range is split into bounded chunks per endpoint. Every completed
+    chunk is checkpointed, so running the same range again after an
+    interruption resumes where it stopped instead of starting over.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, client: OuraClient) -> None:
+        self.hass = hass
+        self._entry = entry
+        self._client = client
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.backfill")
+        self._semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+        self._checkpoint: dict[str, Any] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def async_start(self, start: date, end: date) -> None:
+        """Start a backfill in the background."""
+        if self.running:
+            _LOGGER.warning("A backfill is already running for %s", self._entry.title)
+            return
+        self._task = self._entry.async_create_background_task(
+            self.hass,
+            self.async_run(start, end),
+            f"{DOMAIN} backfill {self._entry.entry_id}",
+        )
+
+    async def async_run(self, start: date, end: date) -> None:
+        """Backfill every endpoint between start and end, inclusive."""
+        stored = await self._store.async_load() or {}
+        if stored.get("start") == start.isoformat() and stored.get("end") == end.isoformat():
+            self._checkpoint = stored
+            _LOGGER.info("Resuming Oura backfill for %s from checkpoint", self._entry.title)
+        else:
+            self._checkpoint = {
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "completed": {},
+            }
+
+        await asyncio.gather(
+            *(self._async_backfill_endpoint(endpoint, start, end) for endpoint in BACKFILL_ENDPOINTS)
+        )
+        self._checkpoint["done"] = True
+        await self._store.async_save(self._checkpoint)
+        _LOGGER.info("Finished Oura backfill for %s", self._entry.title)
+
+    async def _async_backfill_endpoint(self, endpoint: str, start: date, end: date) -> None:
+        completed = self._checkpoint["completed"].get(endpoint)
+        if completed is not None:
+            start = max(start, date.fromisoformat(completed) + timedelta(days=1))
+
+        chunk_days = BACKFILL_HEARTRATE_CHUNK_DAYS if endpoint == "heartrate" else BACKFILL_CHUNK_DAYS
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end)
+            async with self._semaphore:
+                if endpoint == "heartrate":
+                    rows = await self._async_backfill_heartrate(chunk_start, chunk_end)
+                else:
+                    rows = await self._async_backfill_daily(endpoint, chunk_start, chunk_end)
+            _LOGGER.debug(
+                "Backfilled %s rows of %s from %s to %s", rows, endpoint, chunk_start, chunk_end
+            )
+            self._checkpoint["completed"][endpoint] = chunk_end.isoformat()
+            await self._store.async_save(self._checkpoint)
+            chunk_start = chunk_end + timedelta(days=1)
+
+    async def _async_backfill_daily(self, endpoint: str, start: date, end: date) -> int:
+        if endpoint not in DAILY_STATISTICS:
+            return 0
+        records = []
+        sessions = []
+        # end_date is exclusive on the Oura API.
+        async for record in self._client.iter_collection(
+            endpoint, start=start, end=end + timedelta(days=1)
+        ):
+            if endpoint == "sleep" and record.get("type") != "deleted":
+                # Moves the series out of the record as it streams in.
+                sessions.append(SleepSession.from_raw(record))
+            records.append(record)
+
+        if endpoint == "sleep":
+            async_import_sleep_statistics(
+                self.hass, self._entry.entry_id, self._entry.title, sessions
+            )
+            records = list(main_periods(records).values())
+        return async_import_daily_statistics(
+            self.hass, self._entry.entry_id, self._entry.title, endpoint, records
+        )
+
+    async def _async_backfill_heartrate(self, start: date, end: date) -> int:
+        series = HeartRateSeries()
+        collection = self._client.iter_collection(
+            "heartrate", start=start, end=end + timedelta(days=1)
+        )
+        async for batch in collection.batches():
+            series.extend(batch)
+        async_import_heartrate_statistics(
+            self.hass, self._entry.entry_id, self._entry.title, series, 0
+        )
+        return len(series)
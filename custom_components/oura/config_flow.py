@@ -9,11 +9,26 @@ from aiohttp import ClientError
 from aiohttp.client_exceptions import ClientConnectorError
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_TOKEN, CONF_NAME
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_TOKEN, CONF_NAME, CONF_CLIENT_ID, CONF_CLIENT_SECRET
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_PUSH,
+    CONF_DEBUG_TIMINGS,
+    CONF_LIVE_HEARTRATE,
+    CONF_LIVE_HEARTRATE_INTERVAL,
+    DEFAULT_LIVE_HEARTRATE_INTERVAL,
+    MIN_LIVE_HEARTRATE_INTERVAL,
+    MAX_LIVE_HEARTRATE_INTERVAL,
+)
 
 
 class OuraFlowHandler(ConfigFlow, domain=DOMAIN):
@@ -21,6 +36,12 @@ class OuraFlowHandler(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OuraOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OuraOptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -43,4 +64,58 @@ class OuraFlowHandler(ConfigFlow, domain=DOMAIN):
                 }
             ),
             errors=errors,
-        )
\ No newline at end of file
+        )
+
+
+class OuraOptionsFlowHandler(OptionsFlow):
+    """Options flow for Oura."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the Oura options."""
+        errors = {}
+
+        if user_input is not None:
+            if user_input[CONF_PUSH] and not (
+                user_input.get(CONF_CLIENT_ID) and user_input.get(CONF_CLIENT_SECRET)
+            ):
+                errors["base"] = "push_credentials_required"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_PUSH, default=options.get(CONF_PUSH, False)
+                    ): bool,
+                    vol.Optional(
+                        CONF_CLIENT_ID,
+                        description={"suggested_value": options.get(CONF_CLIENT_ID)},
+                    ): str,
+                    vol.Optional(
+                        CONF_CLIENT_SECRET,
+                        description={"suggested_value": options.get(CONF_CLIENT_SECRET)},
+                    ): str,
+                    vol.Required(
+                        CONF_LIVE_HEARTRATE, default=options.get(CONF_LIVE_HEARTRATE, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_LIVE_HEARTRATE_INTERVAL,
+                        default=options.get(
+                            CONF_LIVE_HEARTRATE_INTERVAL, DEFAULT_LIVE_HEARTRATE_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_LIVE_HEARTRATE_INTERVAL, max=MAX_LIVE_HEARTRATE_INTERVAL),
+                    ),
+                    vol.Required(
+                        CONF_DEBUG_TIMINGS, default=options.get(CONF_DEBUG_TIMINGS, False)
+                    ): bool,
+                }
+            ),
+            errors=errors,
+        )
@@ -1,5 +1,75 @@
 """Constants used for Oura."""
 
+from datetime import timedelta
+
 DOMAIN = "oura"
 
 API_ENDPOINT = "https://api.ouraring.com/v2/usercollection"
+WEBHOOK_API_ENDPOINT = "https://api.ouraring.com/v2/webhook/subscription"
+
+DATA_HUB = "hub"
+HUB_CONNECTION_LIMIT = 8
+HUB_KEEPALIVE_TIMEOUT = 330
+HUB_STAGGER_STEP = timedelta(seconds=7)
+HUB_REFRESH_WORKERS = 4
+# Jobs due within this window of each other run in the same tick.
+HUB_COALESCE_WINDOW = timedelta(seconds=2)
+
+MAX_CONCURRENT_REQUESTS = 4
+# Shorter than the scheduler's longest backoff and rate-limit wait; the
+# scheduler is told the time left and gives up rather than outlast it.
+ENDPOINT_TIMEOUT = 8
+UPDATE_TIMEOUT = 30
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+# How often each refresh tier of the endpoint registry is fetched. The
+# coordinator ticks at the shortest interval and only fetches the endpoints
+# that are due.
+REFRESH_TIERS = {
+    "live": timedelta(minutes=5),
+    "arrival": timedelta(minutes=5),
+    "intraday": timedelta(minutes=15),
+    "periodic": timedelta(minutes=30),
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+}
+DEFAULT_REFRESH_INTERVAL = timedelta(minutes=5)
+
+# Endpoints of the arrival tier are polled on their tier's interval only
+# around the time their daily record usually arrives, learned from the last
+# few days. Before any arrival is learned the window is 05:00 to 11:00.
+ARRIVAL_SAMPLES = 14
+ARRIVAL_DEFAULT_WINDOW = (5 * 60, 11 * 60)
+ARRIVAL_MIN_SPREAD = timedelta(minutes=45)
+ARRIVAL_BACKOFF = timedelta(hours=1)
+
+BACKFILL_CHUNK_DAYS = 30
+BACKFILL_HEARTRATE_CHUNK_DAYS = 7
+BACKFILL_CONCURRENCY = 2
+
+SERVICE_BACKFILL = "backfill"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+
+CONF_PUSH = "push"
+# Stored with the webhook id, since subscriptions outlive a restart.
+CONF_VERIFICATION_TOKEN = "verification_token"
+CONF_DEBUG_TIMINGS = "debug_timings"
+CONF_LIVE_HEARTRATE = "live_heartrate"
+CONF_LIVE_HEARTRATE_INTERVAL = "live_heartrate_interval"
+
+# Live heart rate polls only the samples since the last one, on its own
+# cadence, given in seconds.
+DEFAULT_LIVE_HEARTRATE_INTERVAL = 30
+MIN_LIVE_HEARTRATE_INTERVAL = 10
+MAX_LIVE_HEARTRATE_INTERVAL = 300
+
+# Data types Oura pushes through webhooks. These are only polled on the
+# fallback interval while push mode is active.
+PUSH_DATA_TYPES = ("daily_sleep", "daily_readiness", "daily_activity", "daily_stress")
+PUSH_EVENT_TYPES = ("create", "update")
+PUSH_FALLBACK_INTERVAL = timedelta(hours=6)
+SUBSCRIPTION_RENEW_MARGIN = timedelta(days=1)
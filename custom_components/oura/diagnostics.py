@@ -0,0 +1,39 @@
+"""Diagnostics support for Oura."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_CLIENT_SECRET, CONF_TOKEN, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_HUB, DOMAIN
+
+TO_REDACT = {CONF_TOKEN, CONF_CLIENT_SECRET, CONF_WEBHOOK_ID}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["coordinator"]
+    client = data["client"]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "lookups": sorted(coordinator.data or {}),
+            "version": coordinator.data.version if coordinator.data is not None else None,
+            "generations": dict(coordinator.generations),
+            "skipped_writes": coordinator.skipped_writes,
+            "fetch_plan": coordinator.fetch_plan,
+        },
+        "push": data["push"] is not None,
+        # The scheduler is shared by every entry through the hub.
+        "scheduler": client.scheduler.diagnostics(),
+        "engine": hass.data[DOMAIN][DATA_HUB].engine.diagnostics(),
+        "timings": client.instrumentation.summary(),
+    }
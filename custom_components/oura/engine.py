@@ -0,0 +1,183 @@
+"""Central refresh engine shared by every Oura config entry."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DEFAULT_REFRESH_INTERVAL,
+    DOMAIN,
+    HUB_COALESCE_WINDOW,
+    HUB_REFRESH_WORKERS,
+)
+
+if TYPE_CHECKING:
+    from .oura_update_coordinator import OuraUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fractional part of the golden ratio. Multiples of it modulo one are
+# spread evenly over [0, 1) however many there are.
+_GOLDEN = 0.6180339887498949
+
+
+class RefreshEngine:
+    """One schedule and worker pool for the refreshes of every account.
+
+    Each (account, endpoint) pair is a job in a single heap ordered by due
+    time, so scheduling costs O(log n) per job however many accounts are
+    loaded. Jobs are first placed at evenly spread points of their
+    interval, so requests are spread over time instead of every account
+    waking at once, and then repeat at their endpoint's interval.
+
+    A tick takes every job due within a short window and runs them on a
+    bounded number of workers. Each account touched by the tick publishes
+    its results to its listeners once, after all of its jobs are done.
+
+    The engine task is shared by every account, so an error in one
+    account's refresh, publish or rescheduling is logged and the loop
+    carries on with the others.
+    """
+
+    def __init__(self, hass: HomeAssistant, workers: int = HUB_REFRESH_WORKERS) -> None:
+        self.hass = hass
+        self._workers = workers
+        self._window = HUB_COALESCE_WINDOW.total_seconds()
+        # (due, sequence, entry id, endpoint, coordinator); the sequence
+        # keeps ties in insertion order and avoids comparing the rest.
+        self._queue: list[tuple[float, int, str, str, OuraUpdateCoordinator]] = []
+        self._sequence = itertools.count()
+        self._placed = itertools.count(1)
+        self._coordinators: dict[str, OuraUpdateCoordinator] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        self.ticks = 0
+        self.jobs_run = 0
+        self.max_batch = 0
+        self.max_lag = 0.0
+
+    def async_add(self, entry_id: str, coordinator: OuraUpdateCoordinator) -> None:
+        """Schedule every endpoint of an entry's coordinator."""
+        self._coordinators[entry_id] = coordinator
+        now = self.hass.loop.time()
+        for endpoint in coordinator.endpoints:
+            interval = self._interval(coordinator, endpoint)
+            offset = (next(self._placed) * _GOLDEN) % 1.0 * interval
+            self._push(now + offset, entry_id, endpoint, coordinator)
+
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} refresh engine"
+            )
+        self._wakeup.set()
+
+    def async_remove(self, entry_id: str) -> None:
+        """Stop refreshing an entry.
+
+        Its jobs are left in the heap and dropped as they come due, which
+        keeps removal O(1). Jobs of a removed coordinator stay dropped even
+        if the entry is added again with a new one.
+        """
+        self._coordinators.pop(entry_id, None)
+
+    def async_stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return counters describing the engine's recent behaviour."""
+        return {
+            "accounts": len(self._coordinators),
+            "queued_jobs": len(self._queue),
+            "workers": self._workers,
+            "ticks": self.ticks,
+            "jobs_run": self.jobs_run,
+            "max_batch": self.max_batch,
+            "max_lag": round(self.max_lag, 3),
+        }
+
+    def _push(
+        self, due: float, entry_id: str, endpoint: str, coordinator: OuraUpdateCoordinator
+    ) -> None:
+        heapq.heappush(self._queue, (due, next(self._sequence), entry_id, endpoint, coordinator))
+
+    def _active(self, job: tuple) -> bool:
+        return self._coordinators.get(job[2]) is job[4]
+
+    async def _async_run(self) -> None:
+        loop = self.hass.loop
+        while True:
+            delay = self._queue[0][0] - loop.time() if self._queue else None
+            if delay is None or delay > 0:
+                self._wakeup.clear()
+                try:
+                    async with asyncio.timeout(delay):
+                        await self._wakeup.wait()
+                except TimeoutError:
+                    pass
+                continue
+
+            now = loop.time()
+            batch = []
+            while self._queue and self._queue[0][0] <= now + self._window:
+                job = heapq.heappop(self._queue)
+                if self._active(job):
+                    batch.append(job)
+            if batch:
+                self.max_lag = max(self.max_lag, now - batch[0][0])
+                try:
+                    await self._async_tick(batch)
+                except Exception:
+                    _LOGGER.exception("Unexpected error in the Oura refresh engine")
+
+    async def _async_tick(self, batch: list[tuple]) -> None:
+        """Run a batch of due jobs and publish each account once."""
+        self.ticks += 1
+        self.max_batch = max(self.max_batch, len(batch))
+        jobs = deque(batch)
+
+        async def worker() -> None:
+            while jobs:
+                job = jobs.popleft()
+                if not self._active(job):
+                    continue
+                endpoint, coordinator = job[3], job[4]
+                try:
+                    await coordinator.async_refresh_endpoint(endpoint)
+                except Exception:
+                    _LOGGER.exception("Unexpected error refreshing Oura %s", endpoint)
+                self.jobs_run += 1
+
+        await asyncio.gather(*(worker() for _ in range(min(self._workers, len(batch)))))
+
+        active = [job for job in batch if self._active(job)]
+        for coordinator in dict.fromkeys(job[4] for job in active):
+            try:
+                coordinator.async_publish()
+            except Exception:
+                _LOGGER.exception("Unexpected error publishing Oura data")
+
+        # Jobs keep their place in the interval rather than drifting by how
+        # long they took; slots missed while the loop was busy are skipped.
+        now = self.hass.loop.time()
+        for due, _, entry_id, endpoint, coordinator in active:
+            interval = self._interval(coordinator, endpoint)
+            missed = max(0, math.floor((now - due) / interval))
+            self._push(due + (missed + 1) * interval, entry_id, endpoint, coordinator)
+
+    def _interval(self, coordinator: OuraUpdateCoordinator, endpoint: str) -> float:
+        """Return an endpoint's interval, falling back to the default if it cannot be worked out."""
+        try:
+            return coordinator.endpoint_interval(endpoint).total_seconds()
+        except Exception:
+            _LOGGER.exception("Unexpected error scheduling Oura %s", endpoint)
+            return DEFAULT_REFRESH_INTERVAL.total_seconds()
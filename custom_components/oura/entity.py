@@ -3,8 +3,10 @@ from __future__ import annotations
 
 import voluptuous as vol
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.update_coordinator import (
+    BaseCoordinatorEntity,
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
@@ -16,6 +18,7 @@ from .const import (
 from .api.models.ring_configuration import (
     RingConfiguration
 )
+from .snapshot import Snapshot
 
 
 ATTRIBUTION = "Data provided by Oura API"
@@ -44,6 +47,19 @@ class OuraBaseEntity(CoordinatorEntity):
             name=name,
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to this entity's lookup instead of every coordinator update."""
+        # Skip the coordinator entity classes, which would listen to every update.
+        await super(BaseCoordinatorEntity, self).async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_subscribe({self.idx}, self._async_lookup_updated)
+        )
+
+    @callback
+    def _async_lookup_updated(self, snapshot: Snapshot, changed: frozenset[str]) -> None:
+        """Write state when this entity's lookup changed or availability moved."""
+        self.async_write_ha_state()
+
     @property
     def data(self) -> dict[str, Any]:
         """Shortcut to access coordinator data for the entity."""
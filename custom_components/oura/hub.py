@@ -0,0 +1,119 @@
+"""Resources shared by every Oura config entry."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable
+from datetime import timedelta
+
+import aiohttp
+from aiohttp.hdrs import USER_AGENT
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util import ssl as ssl_util
+
+from .api.scheduler import RequestScheduler
+from .const import (
+    DATA_HUB,
+    DEFAULT_REFRESH_INTERVAL,
+    DOMAIN,
+    HUB_CONNECTION_LIMIT,
+    HUB_KEEPALIVE_TIMEOUT,
+    HUB_STAGGER_STEP,
+)
+from .engine import RefreshEngine
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OuraHub:
+    """One HTTP connection pool and request budget for all Oura entries.
+
+    Every entry's client shares the hub's session, so connections to the
+    Oura API are kept alive and reused between polls, and the hub's
+    scheduler so all rings and accounts draw from one request budget.
+    Entries are given staggered slots so their first poll after a restart
+    does not fire at the same moment, and are then refreshed by the hub's
+    refresh engine.
+
+    The session keeps its own connector limits, which Home Assistant's
+    shared sessions do not allow, so the hub closes it itself when Home
+    Assistant shuts down.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit_per_host=HUB_CONNECTION_LIMIT,
+                keepalive_timeout=HUB_KEEPALIVE_TIMEOUT,
+                ssl=ssl_util.get_default_context(),
+            ),
+            headers={USER_AGENT: SERVER_SOFTWARE},
+        )
+        self.scheduler = RequestScheduler()
+        self.engine = RefreshEngine(hass)
+        self._slots: list[str | None] = []
+        self._unsub_close: CALLBACK_TYPE | None = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_handle_close
+        )
+
+    @property
+    def entries(self) -> int:
+        return sum(1 for slot in self._slots if slot is not None)
+
+    def async_register(self, entry_id: str) -> timedelta:
+        """Give an entry a poll slot and return how long its first poll should wait."""
+        if None in self._slots:
+            index = self._slots.index(None)
+            self._slots[index] = entry_id
+        else:
+            index = len(self._slots)
+            self._slots.append(entry_id)
+        offset = (index * HUB_STAGGER_STEP.total_seconds()) % DEFAULT_REFRESH_INTERVAL.total_seconds()
+        return timedelta(seconds=offset)
+
+    def async_unregister(self, entry_id: str) -> None:
+        """Free an entry's poll slot."""
+        if entry_id in self._slots:
+            self._slots[self._slots.index(entry_id)] = None
+
+    async def async_staggered(self, offset: timedelta, job: Awaitable) -> None:
+        """Run a job after the entry's stagger offset."""
+        await asyncio.sleep(offset.total_seconds())
+        await job
+
+    async def _async_handle_close(self, event: Event) -> None:
+        # The listener is removed once it has fired.
+        self._unsub_close = None
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        self.engine.async_stop()
+        await self.session.close()
+
+
+def async_get_hub(hass: HomeAssistant) -> OuraHub:
+    """Return the shared hub, creating it for the first entry."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    hub = domain_data.get(DATA_HUB)
+    if hub is None:
+        hub = domain_data[DATA_HUB] = OuraHub(hass)
+    return hub
+
+
+async def async_release_hub(hass: HomeAssistant, entry_id: str) -> None:
+    """Release an entry's slot and close the hub once no entries are left."""
+    domain_data = hass.data.get(DOMAIN, {})
+    hub: OuraHub | None = domain_data.get(DATA_HUB)
+    if hub is None:
+        return
+    hub.async_unregister(entry_id)
+    hub.engine.async_remove(entry_id)
+    if not hub.entries:
+        domain_data.pop(DATA_HUB)
+        await hub.async_close()
@@ -1,30 +1,379 @@
 """Example integration using DataUpdateCoordinator."""
 
-from datetime import timedelta
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+import itertools
 import logging
+from types import MappingProxyType
 
+import aiohttp
 import async_timeout
 
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
+    UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
-from .api.client import OuraClient
+from .api.client import OuraClient, InvalidOuraAPIResponseError
+from .api.endpoints import ENDPOINTS, MODELS, TIER_ARRIVAL
+from .api.scheduler import OuraRequestError
+from .api.instrumentation import RefreshTimings
+from .statistics import (
+    DAILY_STATISTICS,
+    DailyStatisticsSink,
+    async_get_daily_history,
+    async_import_heartrate_statistics,
+    async_import_sleep_statistics,
+)
+from .trends import TRENDS_LOOKUP, TrendEngine
+from .arrival import ArrivalWindows
+from .snapshot import Snapshot
+from .const import (
+    UPDATE_TIMEOUT,
+    REFRESH_TIERS,
+    DEFAULT_REFRESH_INTERVAL,
+    STORAGE_SAVE_DELAY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 class OuraUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, client: OuraClient):
+    def __init__(self, hass, client: OuraClient, store: Store | None = None):
         """Initialize my coordinator."""
+        self._client = client
+        self._store = store
+        self._intervals = {
+            endpoint: _tier_interval(endpoint) for endpoint in client.endpoints
+        }
+        # Intervals set for an endpoint instead of its tier's.
+        self._interval_overrides: dict[str, timedelta] = {}
+        # Lookups read by the entities enabled in the registry, used until
+        # the entities themselves start listening.
+        self._wanted_lookups: set[str] | None = None
+        # Endpoints worth fetching for the current listeners; rebuilt
+        # whenever an entity is added or removed.
+        self._fetch_plan: list[str] | None = None
+        self._next_refresh: dict[str, datetime] = {}
+        # Fetched by the refresh engine but not yet published.
+        self._pending: list[tuple[list[str], dict, datetime]] = []
+        self._pending_error: UpdateFailed | None = None
+        # Whether any endpoint fetched since the last publish succeeded.
+        self._pending_fetched = False
+        # Bumped per lookup whenever its model changes; published with every
+        # snapshot so readers can tell whether their own data moved.
+        self._generations: dict[str, int] = {}
+        self._version = 0
+        # Subscriptions by id: (lookups, callback, whether the lookups
+        # should be fetched), and the same callbacks indexed by lookup.
+        self._subscriptions: dict[int, tuple[frozenset[str], Callable, bool]] = {}
+        self._subscribers: dict[str, dict[int, Callable]] = {}
+        self._subscription_ids = itertools.count()
+        self._dispatched_version = 0
+        self._dispatched_success = True
+        self.skipped_writes = 0
+        self.trends = TrendEngine()
+        self.arrivals = ArrivalWindows()
+        self._heartrate_imported = 0
+        # Sleep periods already written to statistics, by id and end.
+        self._sleep_imported: set[tuple[str, int]] = set()
         super().__init__(
             hass,
             _LOGGER,
             # Name of the data. For logging purposes.
             name="Oura",
-            # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(minutes=5),
+            # Polling is driven by the hub's refresh engine, one endpoint at
+            # a time. A full refresh only fetches the endpoints that are due.
+            update_interval=None,
+            # The client hands back the same model objects when a payload is
+            # unchanged, so listeners are only notified when something moved.
+            always_update=False,
         )
-        self._client = client
+        self._statistics = DailyStatisticsSink(
+            hass, self.config_entry.entry_id, self.config_entry.title
+        )
+        # The statistics sink only follows what is fetched for the entities.
+        self.async_subscribe(DAILY_STATISTICS, self._statistics.async_handle_snapshot, fetch=False)
+
+    @property
+    def generations(self) -> MappingProxyType:
+        """Generation of each lookup in the current snapshot."""
+        return self.data.generations if self.data is not None else MappingProxyType({})
+
+    async def async_restore(self) -> bool:
+        """Restore the last persisted lookup table.
+
+        Returns True when cached data was restored, so entities can be set up
+        straight away while a fresh fetch runs in the background.
+        """
+        stored = await self._store.async_load() if self._store is not None else None
+        await self._async_seed_trends((stored or {}).get("trends", {}))
+        self.arrivals = ArrivalWindows((stored or {}).get("arrivals"))
+        self._statistics.restore((stored or {}).get("statistics", {}))
+        if not stored:
+            return False
+
+        lookup_table = {}
+        for lookup, raw in stored.get("data", {}).items():
+            model = MODELS.get(lookup)
+            if model is None:
+                continue
+            try:
+                record = model(raw)
+                record.validate()
+            except ValueError as err:
+                _LOGGER.debug("Discarding cached %s: %s", lookup, err)
+            else:
+                lookup_table[lookup] = record
+
+        if "ring" not in lookup_table:
+            return False
+
+        self.async_set_updated_data(self._publish(lookup_table))
+        return True
+
+    async def _async_seed_trends(self, stored: dict) -> None:
+        """Seed the trend windows from the store, or else from imported statistics."""
+        for key, history in stored.items():
+            self.trends.seed(key, history)
+
+        empty = self.trends.empty()
+        if not empty:
+            return
+        history = await async_get_daily_history(
+            self.hass,
+            self.config_entry.entry_id,
+            {metric.statistic for metric in empty},
+            max(metric.days for metric in empty),
+        )
+        for metric in empty:
+            self.trends.seed(metric.key, history.get(metric.statistic, ()))
+
+    def _data_to_store(self) -> dict:
+        """Serialize the lookup table for the store."""
+        return {
+            "data": {
+                lookup: data.as_dict()
+                for lookup, data in (self.data or {}).items()
+                if lookup in MODELS
+            },
+            "trends": self.trends.as_dict(),
+            "arrivals": self.arrivals.as_dict(),
+            "statistics": self._statistics.as_dict(),
+        }
+
+    @property
+    def endpoints(self) -> list[str]:
+        """Endpoints this coordinator can refresh."""
+        return list(self._intervals)
+
+    def endpoint_interval(self, endpoint: str) -> timedelta:
+        """Return how long until an endpoint should be refreshed again."""
+        return self._next_interval(endpoint, self.data or {})
+
+    def _next_interval(self, endpoint: str, lookup_table: dict) -> timedelta:
+        interval = self._intervals[endpoint]
+        if ENDPOINTS[endpoint].tier != TIER_ARRIVAL:
+            return interval
+        now = dt_util.now()
+        record = lookup_table.get(endpoint)
+        arrived = record is not None and record.day == now.date().isoformat()
+        return self.arrivals.next_poll(
+            endpoint, now.hour * 60 + now.minute, arrived, interval
+        )
+
+    def _learn_arrival(self, endpoint: str, previous, record) -> None:
+        """Learn when an arrival-tier endpoint's record for today showed up.
+
+        Sleep periods carry their wake-up time, which is when the data can
+        first be synced. The daily records are only stamped with their day,
+        so for them the time the record first turned up in a poll is used.
+        """
+        now = dt_util.now()
+        today = now.date().isoformat()
+        if record is None or record.day != today:
+            return
+        if previous is not None and previous.day == today:
+            return
+
+        arrived = None
+        if endpoint == "sleep":
+            arrived = dt_util.parse_datetime(record.bedtime_end)
+        elif previous is not None and endpoint in self._next_refresh:
+            # Only arrivals seen between two polls, not on the first poll
+            # after a restart.
+            arrived = now
+        if arrived is not None:
+            arrived = dt_util.as_local(arrived)
+            self.arrivals.add(endpoint, arrived.hour * 60 + arrived.minute)
+
+    def set_push_endpoints(self, endpoints: set[str], fallback: timedelta) -> None:
+        """Poll endpoints that receive webhook pushes only on a slow fallback interval."""
+        for endpoint in self._intervals:
+            interval = self._interval_overrides.get(endpoint, _tier_interval(endpoint))
+            self._intervals[endpoint] = max(interval, fallback) if endpoint in endpoints else interval
+
+    def set_live_heartrate(self, interval: timedelta) -> None:
+        """Poll heart rate on its own short interval.
+
+        Each poll only asks for the samples since the last one, so polling
+        often stays cheap all day.
+        """
+        self._interval_overrides["heartrate"] = interval
+        self._intervals["heartrate"] = interval
+
+    def set_wanted_lookups(self, lookups: set[str]) -> None:
+        """Only fetch the endpoints that fill at least one of these lookups.
+
+        Used for the first refresh, before any entity is listening.
+        """
+        self._wanted_lookups = set(lookups)
+        self._fetch_plan = None
+
+    @callback
+    def async_subscribe(
+        self,
+        lookups: Iterable[str],
+        update_callback: Callable[[Snapshot, frozenset[str]], None],
+        *,
+        fetch: bool = True,
+    ) -> CALLBACK_TYPE:
+        """Call back with each new snapshot in which one of the lookups changed.
+
+        The callback is given the snapshot and the lookups that changed in
+        it, and is also called for every subscriber when the coordinator
+        becomes available or unavailable. Unless fetch is False, the lookups
+        are added to the fetch plan for as long as the subscription lasts.
+        Returns a function that ends the subscription.
+        """
+        subscription_id = next(self._subscription_ids)
+        lookups = frozenset(lookups)
+        self._subscriptions[subscription_id] = (lookups, update_callback, fetch)
+        for lookup in lookups:
+            self._subscribers.setdefault(lookup, {})[subscription_id] = update_callback
+        if fetch:
+            self._fetch_plan = None
+
+        @callback
+        def unsubscribe() -> None:
+            if self._subscriptions.pop(subscription_id, None) is None:
+                return
+            for lookup in lookups:
+                subscribers = self._subscribers[lookup]
+                del subscribers[subscription_id]
+                if not subscribers:
+                    del self._subscribers[lookup]
+            if fetch:
+                self._fetch_plan = None
+
+        return unsubscribe
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Wake the subscribers of the lookups that changed, then the listeners."""
+        self._async_dispatch()
+        super().async_update_listeners()
+
+    @callback
+    def _async_dispatch(self) -> None:
+        snapshot = self.data
+        if snapshot is None:
+            return
+        availability_changed = self.last_update_success != self._dispatched_success
+        if snapshot.version == self._dispatched_version and not availability_changed:
+            return
+        changed = snapshot.changed if snapshot.version != self._dispatched_version else frozenset()
+        self._dispatched_version = snapshot.version
+        self._dispatched_success = self.last_update_success
+
+        if availability_changed:
+            woken = {
+                subscription_id: update_callback
+                for subscription_id, (_, update_callback, _) in self._subscriptions.items()
+            }
+        else:
+            woken = {}
+            for lookup in changed:
+                woken.update(self._subscribers.get(lookup, {}))
+        self.skipped_writes += len(self._subscriptions) - len(woken)
+        for update_callback in woken.values():
+            update_callback(snapshot, changed)
+
+    @callback
+    def async_add_listener(self, update_callback, context=None):
+        """Listen for every update and rebuild the fetch plan as listeners come and go."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        self._fetch_plan = None
+
+        @callback
+        def remove_and_replan() -> None:
+            remove_listener()
+            self._fetch_plan = None
+
+        return remove_and_replan
+
+    @property
+    def fetch_plan(self) -> list[str]:
+        """Endpoints fetched for the current listeners."""
+        if self._fetch_plan is None:
+            self._fetch_plan = self._build_fetch_plan()
+            _LOGGER.debug("Oura fetch plan: %s", self._fetch_plan)
+        return self._fetch_plan
+
+    def _build_fetch_plan(self) -> list[str]:
+        """Return the endpoints that fill a lookup some entity reads.
+
+        Entities subscribe to their lookup, so disabled or removed entities
+        drop out of the plan on their own. The ring is always fetched since
+        every entity's device is built from it.
+        """
+        wanted = {context for context in self.async_contexts() if context is not None}
+        for lookups, _, fetch in self._subscriptions.values():
+            if fetch:
+                wanted |= lookups
+        if not wanted:
+            if self._wanted_lookups is None:
+                return list(self._intervals)
+            wanted = set(self._wanted_lookups)
+        if TRENDS_LOOKUP in wanted:
+            wanted |= self.trends.lookups
+        wanted.add("ring")
+        return [
+            endpoint
+            for endpoint in self._intervals
+            if not wanted.isdisjoint(ENDPOINTS[endpoint].lookups)
+        ]
+
+    async def async_apply_push(self, endpoint: str, document_id: str) -> None:
+        """Fetch a pushed document by id and update just its lookup."""
+        try:
+            document = await self._client.async_get_document(endpoint, document_id)
+        except (InvalidOuraAPIResponseError, OuraRequestError) as err:
+            _LOGGER.warning("Failed to fetch pushed %s %s: %s", endpoint, document_id, err)
+            return
+
+        # Late pushes for older days still belong in the statistics.
+        self._statistics.add(endpoint, [document])
+        self._statistics.async_flush()
+
+        current = (self.data or {}).get(document.lookup)
+        # Pushes can arrive for older days, e.g. after a late ring sync.
+        if current is not None and getattr(document, "day", "") < getattr(current, "day", ""):
+            return
+
+        lookup_table = dict(self.data or {})
+        lookup_table[document.lookup] = document
+        self.async_set_updated_data(self._publish(lookup_table))
+
+    def _due_endpoints(self, now: datetime) -> list[str]:
+        """Return the endpoints whose refresh interval has elapsed."""
+        return [
+            endpoint
+            for endpoint in self.fetch_plan
+            if self._next_refresh.get(endpoint, now) <= now
+        ]
 
     async def _async_update_data(self):
         """Fetch data from API endpoint.
@@ -32,20 +381,186 @@ class OuraUpdateCoordinator(DataUpdateCoordinator):
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
-        # try:
-        # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-        # handled by the data update coordinator.
-        async with async_timeout.timeout(10):
-            result = await self._client.async_get_data()
+        instrumentation = self._client.instrumentation
+        with instrumentation.span("coordinator", "refresh"):
+            now = dt_util.utcnow()
+            due = self._due_endpoints(now)
+            result = await self._async_fetch(due)
+            lookup_table = self._merge_results(dict(self.data or {}), due, result, now)
+        return self._finish_lookup_table(lookup_table)
+
+    async def async_refresh_endpoint(self, endpoint: str) -> None:
+        """Fetch one endpoint for the hub's refresh engine.
+
+        The result is held back until ``async_publish``, so every endpoint
+        the engine fetched in one tick reaches the listeners together. An
+        endpoint that fails only drops its own lookups.
+        """
+        if endpoint not in self.fetch_plan:
+            return
+        now = dt_util.utcnow()
+        # Skip endpoints a full refresh or a push brought up to date meanwhile.
+        if self._next_refresh.get(endpoint, now) - now > self._intervals[endpoint] / 2:
+            return
+        with self._client.instrumentation.span("coordinator", "refresh"):
+            try:
+                result = await self._async_fetch([endpoint])
+            except UpdateFailed as err:
+                self._pending_error = err
+                result = {}
+            else:
+                self._pending_fetched = True
+        self._pending.append(([endpoint], result, now))
+
+    @callback
+    def async_publish(self) -> None:
+        """Publish what the refresh engine fetched since the last call.
+
+        The coordinator as a whole only fails when every endpoint since the
+        last call failed; otherwise the failed endpoints' lookups are dropped
+        and their entities alone become unavailable.
+        """
+        pending, self._pending = self._pending, []
+        error, self._pending_error = self._pending_error, None
+        fetched, self._pending_fetched = self._pending_fetched, False
+        if not pending:
+            return
+        if not fetched:
+            self.async_set_update_error(error)
+            return
+
+        lookup_table = dict(self.data or {})
+        for due, result, now in pending:
+            lookup_table = self._merge_results(lookup_table, due, result, now)
+        self.async_set_updated_data(self._finish_lookup_table(lookup_table))
+
+    async def _async_fetch(self, endpoints: list[str]) -> dict:
+        """Fetch endpoints, raising UpdateFailed when the API cannot be reached."""
+        try:
+            # The refresh engine calls this directly rather than through the
+            # data update coordinator, so timeouts and connection errors are
+            # converted here too. Each endpoint also has its own timeout inside
+            # the client, so one slow endpoint only drops out of the lookup
+            # table instead of failing the whole update.
+            async with async_timeout.timeout(UPDATE_TIMEOUT):
+                return await self._client.async_get_data(endpoints)
         # except ApiAuthError as err:
         #     # Raising ConfigEntryAuthFailed will cancel future updates
         #     # and start a config flow with SOURCE_REAUTH (async_step_reauth)
         #     raise ConfigEntryAuthFailed from err
-        # except ApiError as err:
-        #     raise UpdateFailed(f"Error communicating with API: {err}")
-        lookup_table = {}
-        for data in result:
-            if data is not None:
-                lookup_table[data.lookup] = data
-        
-        return lookup_table
\ No newline at end of file
+        except (InvalidOuraAPIResponseError, OuraRequestError) as err:
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        except TimeoutError as err:
+            raise UpdateFailed("Timeout communicating with API") from err
+        except aiohttp.ClientError as err:
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+    def _merge_results(self, lookup_table: dict, due: list[str], result: dict, now: datetime) -> dict:
+        """Merge fetched endpoints into a lookup table."""
+        # Endpoints that were not due keep their previous data. Due endpoints
+        # that failed are dropped and retried on the next tick.
+        with self._client.instrumentation.span("coordinator", "lookup_table"):
+            previous = {}
+            for endpoint in due:
+                previous[endpoint] = lookup_table.get(endpoint)
+                for lookup in ENDPOINTS[endpoint].lookups:
+                    lookup_table.pop(lookup, None)
+
+            for endpoint, data in result.items():
+                for item in data if isinstance(data, list) else [data]:
+                    if item is not None:
+                        lookup_table[item.lookup] = item
+
+            for endpoint in due:
+                if endpoint not in result:
+                    continue
+                if ENDPOINTS[endpoint].tier == TIER_ARRIVAL:
+                    self._learn_arrival(endpoint, previous[endpoint], lookup_table.get(endpoint))
+                self._next_refresh[endpoint] = now + self._next_interval(endpoint, lookup_table)
+
+        if "heartrate" in result:
+            self._import_heartrate_statistics()
+        if "sleep" in result:
+            self._import_sleep_statistics()
+
+        return lookup_table
+
+    def _finish_lookup_table(self, lookup_table: dict) -> Snapshot:
+        """Add the refresh timings and publish a freshly merged lookup table."""
+        instrumentation = self._client.instrumentation
+        if instrumentation.enabled:
+            timings = RefreshTimings.from_instrumentation(instrumentation)
+            lookup_table[timings.lookup] = timings
+        return self._publish(lookup_table)
+
+    def _publish(self, lookup_table: dict) -> Snapshot:
+        """Turn a lookup table into the next snapshot.
+
+        The lookup table is owned by the snapshot afterwards. When no lookup
+        changed the current snapshot is returned instead, so listeners are
+        not woken at all.
+        """
+        previous = self.data if self.data is not None else {}
+        changed = self._bump_generations(previous, lookup_table)
+        # Trends are only recomputed when one of the days they follow moved.
+        if not changed.isdisjoint(self.trends.lookups) or TRENDS_LOOKUP not in lookup_table:
+            lookup_table[TRENDS_LOOKUP] = self.trends.update(lookup_table)
+            changed |= self._bump_generations(
+                {TRENDS_LOOKUP: previous.get(TRENDS_LOOKUP)},
+                {TRENDS_LOOKUP: lookup_table[TRENDS_LOOKUP]},
+            )
+
+        if not changed and self.data is not None:
+            return self.data
+
+        self._version += 1
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+        return Snapshot(lookup_table, self._version, self._generations, frozenset(changed))
+
+    def _import_heartrate_statistics(self) -> None:
+        """Import the heart-rate hours added since the last import."""
+        timestamps = self._client.heartrate_series.timestamps
+        # The hour being imported is rewritten until it is complete, so with
+        # frequent polls only import once a new hour has started.
+        if timestamps and timestamps[-1] - timestamps[-1] % 3600 <= self._heartrate_imported:
+            return
+        imported = async_import_heartrate_statistics(
+            self.hass,
+            self.config_entry.entry_id,
+            self.config_entry.title,
+            self._client.heartrate_series,
+            self._heartrate_imported,
+        )
+        if imported is not None:
+            self._heartrate_imported = imported
+
+    def _import_sleep_statistics(self) -> None:
+        """Import the sleep periods that are new or changed since the last import."""
+        sessions = self._client.sleep_sessions.values()
+        pending = [session for session in sessions if session.key not in self._sleep_imported]
+        if not pending:
+            return
+        async_import_sleep_statistics(
+            self.hass,
+            self.config_entry.entry_id,
+            self.config_entry.title,
+            pending,
+        )
+        # Periods only stay in the fetch window for two days.
+        self._sleep_imported = {session.key for session in sessions}
+
+    def _bump_generations(self, previous, current) -> set[str]:
+        """Bump the generation of every lookup whose model changed and return them."""
+        changed = set()
+        for lookup in previous.keys() | current.keys():
+            old = previous.get(lookup)
+            new = current.get(lookup)
+            if old is not new and old != new:
+                self._generations[lookup] = self._generations.get(lookup, 0) + 1
+                changed.add(lookup)
+        return changed
+
+def _tier_interval(endpoint: str) -> timedelta:
+    """Return the refresh interval of an endpoint's registry tier."""
+    return REFRESH_TIERS.get(ENDPOINTS[endpoint].tier, DEFAULT_REFRESH_INTERVAL)
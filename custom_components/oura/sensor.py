@@ -6,14 +6,16 @@ import voluptuous as vol
 from typing import Any, Optional
 from collections.abc import Callable
 from dataclasses import dataclass
+from operator import attrgetter
 from datetime import datetime
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass, SensorDeviceClass, SensorEntityDescription, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_ATTRIBUTION, UnitOfLength, UnitOfTime, UnitOfMass, UnitOfEnergy
+from homeassistant.const import ATTR_ATTRIBUTION, EntityCategory, PERCENTAGE, UnitOfLength, UnitOfTime, UnitOfMass, UnitOfEnergy, UnitOfInformation
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_platform
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.typing import StateType
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import (
@@ -21,9 +23,11 @@ from homeassistant.helpers.update_coordinator import (
 )
 from homeassistant.util import dt as dt_util
 from .const import (
-    DOMAIN
+    DOMAIN,
+    CONF_DEBUG_TIMINGS,
 )
 
+from .api.endpoints import MODELS
 from .oura_update_coordinator import OuraUpdateCoordinator
 from .entity import OuraBaseEntity
 
@@ -36,14 +40,19 @@ class OuraSensorEntityDescription(SensorEntityDescription):
 
     lookup_key: str
     value_fn: Callable[[dict[str, Any]], StateType]
+    # Extra state attributes as (attribute, dotted field path) pairs. The
+    # sensor named after its lookup also gets one attribute per field of
+    # the model's contributors, if it has any.
+    attributes: tuple[tuple[str, str], ...] = ()
 
+# Sensors whose value is also written to the daily statistics have no state
+# class, so the recorder does not keep a second set of statistics for them.
 DAILY_SENSORS = (
     OuraSensorEntityDescription(
         key="daily_readiness",
         lookup_key="daily_readiness",
         translation_key="daily_readiness",
-        value_fn=lambda data: data.score,
-        state_class=SensorStateClass.MEASUREMENT
+        value_fn=lambda data: data.score
     ),
     OuraSensorEntityDescription(
         key="daily_resilience",
@@ -55,15 +64,63 @@ DAILY_SENSORS = (
         key="daily_sleep",
         lookup_key="daily_sleep",
         translation_key="daily_sleep",
-        value_fn=lambda data: data.score,
-        state_class=SensorStateClass.MEASUREMENT
+        value_fn=lambda data: data.score
+    ),
+    OuraSensorEntityDescription(
+        key="total_sleep_duration",
+        lookup_key="sleep",
+        translation_key="total_sleep_duration",
+        value_fn=lambda data: data.total_sleep_duration,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.HOURS
+    ),
+    OuraSensorEntityDescription(
+        key="deep_sleep_duration",
+        lookup_key="sleep",
+        translation_key="deep_sleep_duration",
+        value_fn=lambda data: data.deep_sleep_duration,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.HOURS
+    ),
+    OuraSensorEntityDescription(
+        key="rem_sleep_duration",
+        lookup_key="sleep",
+        translation_key="rem_sleep_duration",
+        value_fn=lambda data: data.rem_sleep_duration,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.HOURS
+    ),
+    OuraSensorEntityDescription(
+        key="light_sleep_duration",
+        lookup_key="sleep",
+        translation_key="light_sleep_duration",
+        value_fn=lambda data: data.light_sleep_duration,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.HOURS
+    ),
+    OuraSensorEntityDescription(
+        key="average_hrv",
+        lookup_key="sleep",
+        translation_key="average_hrv",
+        value_fn=lambda data: data.average_hrv,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS
+    ),
+    OuraSensorEntityDescription(
+        key="lowest_heart_rate",
+        lookup_key="sleep",
+        translation_key="lowest_heart_rate",
+        value_fn=lambda data: data.lowest_heart_rate,
+        native_unit_of_measurement="bpm"
     ),
     OuraSensorEntityDescription(
         key="daily_stress",
         lookup_key="daily_stress",
         translation_key="daily_stress",
-        value_fn=lambda data: data.stress_high,
-        state_class=SensorStateClass.MEASUREMENT
+        value_fn=lambda data: data.stress_high
     ),
     OuraSensorEntityDescription(
         key="heartrate",
@@ -72,14 +129,121 @@ DAILY_SENSORS = (
         value_fn=lambda data: data.bpm,
         state_class=SensorStateClass.MEASUREMENT
     ),
-    # OuraSensorEntityDescription(
-    #     key="daily_cardiovascular_age",
-    #     lookup_key="daily_cardiovascular_age",
-    #     translation_key="daily_cardiovascular_age",
-    #     value_fn=lambda data: data.vascular_age,
-    #     state_class=SensorStateClass.MEASUREMENT,
-    #     native_unit_of_measurement=UnitOfTime.YEARS
-    # ),
+    OuraSensorEntityDescription(
+        key="heartrate_min",
+        lookup_key="heartrate_summary",
+        translation_key="heartrate_min",
+        value_fn=lambda data: data.min,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="bpm"
+    ),
+    OuraSensorEntityDescription(
+        key="heartrate_max",
+        lookup_key="heartrate_summary",
+        translation_key="heartrate_max",
+        value_fn=lambda data: data.max,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="bpm"
+    ),
+    OuraSensorEntityDescription(
+        key="heartrate_mean",
+        lookup_key="heartrate_summary",
+        translation_key="heartrate_mean",
+        value_fn=lambda data: round(data.mean, 1),
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="bpm"
+    ),
+    OuraSensorEntityDescription(
+        key="resting_heart_rate",
+        lookup_key="heartrate_summary",
+        translation_key="resting_heart_rate",
+        value_fn=lambda data: round(data.resting, 1) if data.resting is not None else None,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="bpm"
+    ),
+    OuraSensorEntityDescription(
+        key="daily_cardiovascular_age",
+        lookup_key="daily_cardiovascular_age",
+        translation_key="daily_cardiovascular_age",
+        value_fn=lambda data: data.vascular_age,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.YEARS
+    ),
+    OuraSensorEntityDescription(
+        key="spo2",
+        lookup_key="daily_spo2",
+        translation_key="spo2",
+        value_fn=lambda data: data.spo2_percentage.average if data.spo2_percentage is not None else None,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE
+    ),
+    OuraSensorEntityDescription(
+        key="breathing_disturbance_index",
+        lookup_key="daily_spo2",
+        translation_key="breathing_disturbance_index",
+        value_fn=lambda data: data.breathing_disturbance_index,
+        state_class=SensorStateClass.MEASUREMENT
+    ),
+    OuraSensorEntityDescription(
+        key="vo2_max",
+        lookup_key="vo2_max",
+        translation_key="vo2_max",
+        value_fn=lambda data: data.vo2_max,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="mL/kg/min"
+    ),
+    OuraSensorEntityDescription(
+        key="workout",
+        lookup_key="workout",
+        translation_key="workout",
+        value_fn=lambda data: data.activity,
+        attributes=(
+            ("intensity", "intensity"),
+            ("label", "label"),
+            ("source", "source"),
+            ("start", "start_datetime"),
+            ("end", "end_datetime"),
+        )
+    ),
+    OuraSensorEntityDescription(
+        key="workout_calories",
+        lookup_key="workout",
+        translation_key="workout_calories",
+        value_fn=lambda data: data.calories,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfEnergy.KILO_CALORIE
+    ),
+    OuraSensorEntityDescription(
+        key="workout_distance",
+        lookup_key="workout",
+        translation_key="workout_distance",
+        value_fn=lambda data: data.distance,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfLength.METERS
+    ),
+    OuraSensorEntityDescription(
+        key="session",
+        lookup_key="session",
+        translation_key="session",
+        value_fn=lambda data: data.type,
+        attributes=(
+            ("mood", "mood"),
+            ("start", "start_datetime"),
+            ("end", "end_datetime"),
+        )
+    ),
+    OuraSensorEntityDescription(
+        key="enhanced_tag",
+        lookup_key="enhanced_tag",
+        translation_key="enhanced_tag",
+        value_fn=lambda data: data.custom_name or data.tag_type_code,
+        attributes=(
+            ("tag_type_code", "tag_type_code"),
+            ("comment", "comment"),
+            ("start", "start_time"),
+            ("end", "end_time"),
+        )
+    ),
     OuraSensorEntityDescription(
         key="age",
         lookup_key="personal_info",
@@ -108,15 +272,13 @@ DAILY_SENSORS = (
         key="daily_activity",
         lookup_key="daily_activity",
         translation_key="daily_activity",
-        value_fn=lambda data: data.score,
-        state_class=SensorStateClass.MEASUREMENT
+        value_fn=lambda data: data.score
     ),
     OuraSensorEntityDescription(
         key="total_calories",
         lookup_key="daily_activity",
         translation_key="total_calories",
         value_fn=lambda data: data.total_calories,
-        state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfEnergy.KILO_CALORIE
     ),
     OuraSensorEntityDescription(
@@ -132,27 +294,139 @@ DAILY_SENSORS = (
         lookup_key="daily_activity",
         translation_key="active_calories",
         value_fn=lambda data: data.active_calories,
-        state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfEnergy.KILO_CALORIE
     ),
     OuraSensorEntityDescription(
         key="steps",
         lookup_key="daily_activity",
         translation_key="steps",
-        value_fn=lambda data: data.steps,
-        state_class=SensorStateClass.MEASUREMENT
+        value_fn=lambda data: data.steps
     ),
     OuraSensorEntityDescription(
         key="equivalent_walking_distance",
         lookup_key="daily_activity",
         translation_key="equivalent_walking_distance",
         value_fn=lambda data: data.equivalent_walking_distance,
-        state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfLength.METERS
     ),
+    OuraSensorEntityDescription(
+        key="readiness_7d_average",
+        lookup_key="trends",
+        translation_key="readiness_7d_average",
+        value_fn=lambda data: data.readiness_7d.mean,
+        state_class=SensorStateClass.MEASUREMENT,
+        attributes=(
+            ("days", "readiness_7d.days"),
+            ("std", "readiness_7d.std"),
+        )
+    ),
+    OuraSensorEntityDescription(
+        key="sleep_score_14d_baseline",
+        lookup_key="trends",
+        translation_key="sleep_score_14d_baseline",
+        value_fn=lambda data: data.sleep_score_14d.mean,
+        state_class=SensorStateClass.MEASUREMENT,
+        attributes=(
+            ("days", "sleep_score_14d.days"),
+            ("std", "sleep_score_14d.std"),
+            ("z_score", "sleep_score_14d.z_score"),
+        )
+    ),
+    OuraSensorEntityDescription(
+        key="hrv_14d_baseline",
+        lookup_key="trends",
+        translation_key="hrv_14d_baseline",
+        value_fn=lambda data: data.hrv_14d.mean,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        attributes=(
+            ("days", "hrv_14d.days"),
+            ("std", "hrv_14d.std"),
+        )
+    ),
+    OuraSensorEntityDescription(
+        key="hrv_deviation",
+        lookup_key="trends",
+        translation_key="hrv_deviation",
+        value_fn=lambda data: data.hrv_14d.z_score,
+        state_class=SensorStateClass.MEASUREMENT,
+        attributes=(
+            ("latest", "hrv_14d.latest"),
+            ("baseline", "hrv_14d.mean"),
+        )
+    ),
+    OuraSensorEntityDescription(
+        key="steps_7d_total",
+        lookup_key="trends",
+        translation_key="steps_7d_total",
+        value_fn=lambda data: data.steps_7d.total,
+        state_class=SensorStateClass.MEASUREMENT,
+        attributes=(
+            ("days", "steps_7d.days"),
+            ("average", "steps_7d.mean"),
+        )
+    ),
 )
 
 
+# Only created when refresh timings are enabled in the options.
+DEBUG_SENSORS = (
+    OuraSensorEntityDescription(
+        key="refresh_p50",
+        lookup_key="instrumentation",
+        translation_key="refresh_p50",
+        value_fn=lambda data: data.refresh_p50,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC
+    ),
+    OuraSensorEntityDescription(
+        key="refresh_p95",
+        lookup_key="instrumentation",
+        translation_key="refresh_p95",
+        value_fn=lambda data: data.refresh_p95,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC
+    ),
+    OuraSensorEntityDescription(
+        key="bytes_received",
+        lookup_key="instrumentation",
+        translation_key="bytes_received",
+        value_fn=lambda data: data.bytes_received,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        entity_category=EntityCategory.DIAGNOSTIC
+    ),
+)
+
+
+def sensor_descriptions(options) -> tuple[OuraSensorEntityDescription, ...]:
+    """Return the descriptions of the sensors created for a config entry's options."""
+    if options.get(CONF_DEBUG_TIMINGS):
+        return DAILY_SENSORS + DEBUG_SENSORS
+    return DAILY_SENSORS
+
+
+def entity_lookups(hass: HomeAssistant, config_entry: ConfigEntry) -> set[str]:
+    """Return the lookups read by the config entry's sensors that are not disabled."""
+    registry = er.async_get(hass)
+    registered = {
+        entity.unique_id: entity
+        for entity in er.async_entries_for_config_entry(registry, config_entry.entry_id)
+    }
+    lookups = set()
+    for description in sensor_descriptions(config_entry.options):
+        entity = registered.get(f"{description.lookup_key}_{description.key}")
+        if entity is None:
+            enabled = description.entity_registry_enabled_default
+        else:
+            enabled = entity.disabled_by is None
+        if enabled:
+            lookups.add(description.lookup_key)
+    return lookups
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -162,19 +436,33 @@ async def async_setup_entry(
     coordinator: OuraUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     name: str = hass.data[DOMAIN][config_entry.entry_id]["name"]
 
-    await coordinator.async_config_entry_first_refresh()
-
     sensors = [
         OuraSensor(
             coordinator,
             entity_description,
             name
         )
-        for entity_description in DAILY_SENSORS
+        for entity_description in sensor_descriptions(config_entry.options)
     ]
 
     async_add_entities(sensors) 
 
+def compile_attributes(
+    description: OuraSensorEntityDescription,
+) -> tuple[tuple[str, Callable[[Any], Any]], ...]:
+    """Turn a description's attribute paths into getters, adding its contributors."""
+    fields = description.attributes
+    if description.key == description.lookup_key:
+        model = MODELS.get(description.lookup_key)
+        contributors = model._fields.get("contributors") if model is not None else None
+        if contributors is not None and contributors.nested:
+            fields = (
+                *((name, f"contributors.{name}") for name in contributors.type._fields),
+                *fields,
+            )
+    return tuple((name, attrgetter(path)) for name, path in fields)
+
+
 class OuraSensor(OuraBaseEntity, SensorEntity):
     """Representation of a Oura sensor."""
 
@@ -189,51 +477,47 @@ class OuraSensor(OuraBaseEntity, SensorEntity):
         super().__init__(coordinator, idx, name)
 
         self.entity_description = entity_description
+        self._attribute_getters = compile_attributes(entity_description)
+        # State and attributes are computed once per generation of the lookup.
+        self._cached_generation: int | None = None
+        self._cached_state: StateType = None
+        self._cached_attributes: dict[str, Any] = {}
 
         self._attr_unique_id = f"{self.idx}_{self.entity_description.key}"
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the state."""
+    def _update_cache(self) -> None:
+        generation = self.coordinator.generations.get(self.idx, 0)
+        if generation == self._cached_generation:
+            return
+        self._cached_generation = generation
+
+        data = (self.coordinator.data or {}).get(self.idx)
+        if data is None:
+            self._cached_state = None
+            self._cached_attributes = {}
+            return
 
         try:
-            state = self.entity_description.value_fn(self.data)
+            self._cached_state = self.entity_description.value_fn(data)
         except (KeyError, ValueError):
-            return None
+            self._cached_state = None
+
+        attributes = {}
+        for name, getter in self._attribute_getters:
+            try:
+                attributes[name] = getter(data)
+            except (AttributeError, ValueError):
+                attributes[name] = None
+        self._cached_attributes = attributes
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state."""
+        self._update_cache()
+        return self._cached_state
 
-        return state
-    
     @property
     def extra_state_attributes(self):
         """Returns the sensor attributes."""
-        match self.entity_description.key:
-            case "daily_readiness":
-                return {
-                    "activity_balance": self.data.contributors.activity_balance,
-                    "body_temperature": self.data.contributors.body_temperature,
-                    "hrv_balance": self.data.contributors.hrv_balance,
-                    "previous_day_activity": self.data.contributors.previous_day_activity,
-                    "previous_night": self.data.contributors.previous_night,
-                    "recovery_index": self.data.contributors.recovery_index,
-                    "resting_heart_rate": self.data.contributors.resting_heart_rate,
-                    "sleep_balance": self.data.contributors.sleep_balance
-                }
-            case "daily_sleep":
-                return {
-                    "deep_sleep": self.data.contributors.deep_sleep,
-                    "efficiency": self.data.contributors.efficiency,
-                    "latency": self.data.contributors.latency,
-                    "rem_sleep": self.data.contributors.rem_sleep,
-                    "restfulness": self.data.contributors.restfulness,
-                    "timing": self.data.contributors.timing,
-                    "total_sleep": self.data.contributors.total_sleep
-                }
-            case "daily_resilience":
-                return {
-                    "sleep_recovery": self.data.contributors.sleep_recovery,
-                    "daytime_recovery": self.data.contributors.daytime_recovery,
-                    "stress": self.data.contributors.stress
-                }
-            case _:
-                return {}
-        return self._attributes
\ No newline at end of file
+        self._update_cache()
+        return self._cached_attributes
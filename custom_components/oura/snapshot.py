@@ -0,0 +1,74 @@
+"""Immutable, versioned lookup tables published by the coordinator."""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from types import MappingProxyType
+from typing import Any
+
+
+class Snapshot(Mapping[str, Any]):
+    """A lookup table that is never changed once published.
+
+    Each refresh that changes anything publishes a new snapshot with the
+    next version, so entities and other readers can hold on to one and
+    share it without copying. Alongside the models it carries the
+    generation of every lookup and the lookups that changed since the
+    previous version.
+    """
+
+    __slots__ = ("_changed", "_data", "_generations", "_version")
+
+    def __init__(
+        self,
+        data: dict[str, Any],
+        version: int,
+        generations: Mapping[str, int],
+        changed: frozenset[str],
+    ) -> None:
+        # The snapshot takes ownership of data; nothing else may change it.
+        self._data = data
+        self._version = version
+        self._generations = MappingProxyType(dict(generations))
+        self._changed = changed
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def generations(self) -> Mapping[str, int]:
+        """Generation of each lookup as of this version."""
+        return self._generations
+
+    @property
+    def changed(self) -> frozenset[str]:
+        """Lookups whose model changed since the previous version."""
+        return self._changed
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        # A new snapshot is only published when something changed, so two
+        # different snapshots never hold the same lookups. This keeps the
+        # coordinator's change check from comparing every model.
+        if isinstance(other, Snapshot):
+            return self is other
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"<Snapshot version={self._version} lookups={sorted(self._data)}>"
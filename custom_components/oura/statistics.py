@@ -0,0 +1,342 @@
+"""Long-term statistics imported by the Oura integration."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from datetime import date, timedelta
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import UnitOfEnergy, UnitOfLength, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .api.endpoints import ENDPOINTS
+from .api.heartrate_series import HeartRateSeries
+from .api.models.base import Record
+from .api.sleep_session import SleepSession
+from .const import DOMAIN
+
+HEART_RATE_UNIT = "bpm"
+
+
+def _contributor_statistics(endpoint: str, prefix: str) -> tuple[tuple[str, str, str, str | None], ...]:
+    """Return one statistic per contributor of an endpoint's model."""
+    contributors = ENDPOINTS[endpoint].model._fields["contributors"].type
+    return tuple(
+        (
+            f"{prefix}_{field}",
+            f"contributors.{field}",
+            f"{prefix.title()} {field.replace('_', ' ').title()}",
+            None,
+        )
+        for field in contributors._fields
+    )
+
+# Daily record fields imported as statistics, per endpoint:
+# (statistic key, record field, display name, unit). Nested fields are
+# dotted, e.g. "contributors.stress".
+DAILY_STATISTICS: dict[str, tuple[tuple[str, str, str, str | None], ...]] = {
+    "daily_sleep": (
+        ("daily_sleep", "score", "Daily Sleep", None),
+        *_contributor_statistics("daily_sleep", "sleep"),
+    ),
+    "sleep": (
+        ("total_sleep_duration", "total_sleep_duration", "Total Sleep Duration", UnitOfTime.SECONDS),
+        ("deep_sleep_duration", "deep_sleep_duration", "Deep Sleep Duration", UnitOfTime.SECONDS),
+        ("rem_sleep_duration", "rem_sleep_duration", "REM Sleep Duration", UnitOfTime.SECONDS),
+        ("light_sleep_duration", "light_sleep_duration", "Light Sleep Duration", UnitOfTime.SECONDS),
+        ("average_hrv", "average_hrv", "Average HRV", UnitOfTime.MILLISECONDS),
+        ("lowest_heart_rate", "lowest_heart_rate", "Lowest Heart Rate", HEART_RATE_UNIT),
+    ),
+    "daily_readiness": (
+        ("daily_readiness", "score", "Daily Readiness", None),
+        *_contributor_statistics("daily_readiness", "readiness"),
+    ),
+    "daily_activity": (
+        ("daily_activity", "score", "Daily Activity", None),
+        ("steps", "steps", "Steps", None),
+        ("active_calories", "active_calories", "Active Calories Burned", UnitOfEnergy.KILO_CALORIE),
+        ("total_calories", "total_calories", "Total Calories Burned", UnitOfEnergy.KILO_CALORIE),
+        ("equivalent_walking_distance", "equivalent_walking_distance", "Equivalent Walking Distance", UnitOfLength.METERS),
+        *_contributor_statistics("daily_activity", "activity"),
+    ),
+    "daily_stress": (
+        ("stress_high", "stress_high", "Daily Stress", None),
+        ("recovery_high", "recovery_high", "Daily Recovery", None),
+    ),
+    "daily_resilience": _contributor_statistics("daily_resilience", "resilience"),
+}
+
+
+def statistic_id(entry_id: str, key: str) -> str:
+    """Return the external statistic id for a config entry and metric."""
+    return f"{DOMAIN}:{key}_{entry_id.lower()}"
+
+
+@callback
+def async_import_heartrate_statistics(
+    hass: HomeAssistant,
+    entry_id: str,
+    name: str,
+    series: HeartRateSeries,
+    since: int,
+) -> int | None:
+    """Import hourly heart-rate statistics for every hour starting at or after since.
+
+    Returns the start of the last hour imported. That hour may still be
+    filling up, so callers pass it back as since next time and it is
+    overwritten once it is complete.
+    """
+    if "recorder" not in hass.config.components:
+        return None
+
+    rows = [
+        StatisticData(
+            start=dt_util.utc_from_timestamp(hour),
+            mean=mean,
+            min=low,
+            max=high,
+        )
+        for hour, mean, low, high in series.hourly(since)
+    ]
+    if not rows:
+        return None
+
+    metadata = StatisticMetaData(
+        has_mean=True,
+        has_sum=False,
+        name=f"{name} Heart Rate",
+        source=DOMAIN,
+        statistic_id=statistic_id(entry_id, "heartrate"),
+        unit_of_measurement=HEART_RATE_UNIT,
+    )
+    async_add_external_statistics(hass, metadata, rows)
+    return int(rows[-1]["start"].timestamp())
+
+
+@callback
+def async_import_sleep_statistics(
+    hass: HomeAssistant,
+    entry_id: str,
+    name: str,
+    sessions: Iterable[SleepSession],
+) -> int:
+    """Import hourly heart rate and HRV during the given sleep periods.
+
+    Returns the number of rows written.
+    """
+    if "recorder" not in hass.config.components:
+        return 0
+
+    series = {"sleep_heart_rate": [], "sleep_hrv": []}
+    for session in sessions:
+        for key, samples in (("sleep_heart_rate", session.heart_rate), ("sleep_hrv", session.hrv)):
+            if samples is None:
+                continue
+            series[key].extend(
+                StatisticData(start=dt_util.utc_from_timestamp(hour), mean=mean, min=low, max=high)
+                for hour, mean, low, high in samples.hourly()
+            )
+
+    written = 0
+    for key, display_name, unit in (
+        ("sleep_heart_rate", "Sleep Heart Rate", HEART_RATE_UNIT),
+        ("sleep_hrv", "Sleep HRV", UnitOfTime.MILLISECONDS),
+    ):
+        rows = sorted(series[key], key=lambda row: row["start"])
+        if not rows:
+            continue
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"{name} {display_name}",
+            source=DOMAIN,
+            statistic_id=statistic_id(entry_id, key),
+            unit_of_measurement=unit,
+        )
+        async_add_external_statistics(hass, metadata, rows)
+        written += len(rows)
+    return written
+
+
+@callback
+def async_import_daily_statistics(
+    hass: HomeAssistant,
+    entry_id: str,
+    name: str,
+    endpoint: str,
+    records: Iterable[dict[str, Any]],
+) -> int:
+    """Import raw daily records as one statistic per field, stamped with their day.
+
+    Returns the number of rows written.
+    """
+    if "recorder" not in hass.config.components:
+        return 0
+
+    rows: dict[str, list[StatisticData]] = {}
+    _add_daily_rows(rows, endpoint, records)
+    return _async_write_daily_rows(hass, entry_id, name, rows)
+
+
+class DailyStatisticsSink:
+    """Writes the daily records of each refresh once, stamped with their day.
+
+    Records are collected across endpoints and written together by
+    ``async_flush``. A record is skipped while it is identical to the one
+    last written with the same id, so only new days and records that were
+    revised during the day reach the recorder. The records last written
+    are kept in the coordinator's store, so a restart does not write them
+    all again.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, name: str) -> None:
+        self.hass = hass
+        self._entry_id = entry_id
+        self._name = name
+        # Fields of the last record written, per endpoint and id.
+        self._written: dict[str, dict[str, dict[str, Any]]] = {}
+        self._pending: dict[str, list[dict[str, Any]]] = {}
+
+    def add(self, endpoint: str, records: Iterable[Record]) -> None:
+        """Queue the records of an endpoint that were not written yet."""
+        if endpoint not in DAILY_STATISTICS:
+            return
+        written = self._written.get(endpoint, {})
+        latest = {}
+        for record in records:
+            if record is None:
+                continue
+            raw = record.as_dict()
+            if written.get(record.id) != raw:
+                self._pending.setdefault(endpoint, []).append(raw)
+            latest[record.id] = raw
+        # Only the records still being refreshed can change again.
+        self._written[endpoint] = latest
+
+    def restore(self, stored: Mapping[str, Mapping[str, dict[str, Any]]]) -> None:
+        """Restore the records last written, as returned by ``as_dict``."""
+        self._written = {
+            endpoint: dict(records)
+            for endpoint, records in stored.items()
+            if endpoint in DAILY_STATISTICS
+        }
+
+    def as_dict(self) -> dict[str, dict[str, dict[str, Any]]]:
+        return self._written
+
+    @callback
+    def async_handle_snapshot(self, snapshot: Mapping[str, Any], changed: frozenset[str]) -> None:
+        """Write the daily records that changed in a new coordinator snapshot."""
+        for endpoint in changed:
+            record = snapshot.get(endpoint)
+            if record is not None:
+                self.add(endpoint, [record])
+        # Every endpoint's daily records go to the recorder together.
+        self.async_flush()
+
+    @callback
+    def async_flush(self) -> int:
+        """Write everything queued since the last flush.
+
+        Returns the number of rows written.
+        """
+        pending, self._pending = self._pending, {}
+        if not pending or "recorder" not in self.hass.config.components:
+            return 0
+
+        rows: dict[str, list[StatisticData]] = {}
+        for endpoint, records in pending.items():
+            _add_daily_rows(rows, endpoint, records)
+        return _async_write_daily_rows(self.hass, self._entry_id, self._name, rows)
+
+
+# Display name and unit of every daily statistic, by key.
+_DAILY_METADATA = {
+    key: (display_name, unit)
+    for fields in DAILY_STATISTICS.values()
+    for key, _, display_name, unit in fields
+}
+
+
+def _add_daily_rows(
+    rows: dict[str, list[StatisticData]],
+    endpoint: str,
+    records: Iterable[dict[str, Any]],
+) -> None:
+    """Add a row per statistic field of each raw record."""
+    fields = DAILY_STATISTICS.get(endpoint, ())
+    for record in records:
+        start = dt_util.start_of_local_day(date.fromisoformat(record["day"]))
+        for key, field, _, _ in fields:
+            value = _get_field(record, field)
+            if value is not None:
+                rows.setdefault(key, []).append(
+                    StatisticData(start=start, mean=value, min=value, max=value)
+                )
+
+
+@callback
+def _async_write_daily_rows(
+    hass: HomeAssistant,
+    entry_id: str,
+    name: str,
+    rows: dict[str, list[StatisticData]],
+) -> int:
+    """Write the rows of each daily statistic."""
+    written = 0
+    for key, key_rows in rows.items():
+        display_name, unit = _DAILY_METADATA[key]
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"{name} {display_name}",
+            source=DOMAIN,
+            statistic_id=statistic_id(entry_id, key),
+            unit_of_measurement=unit,
+        )
+        async_add_external_statistics(
+            hass, metadata, sorted(key_rows, key=lambda row: row["start"])
+        )
+        written += len(key_rows)
+    return written
+
+
+async def async_get_daily_history(
+    hass: HomeAssistant,
+    entry_id: str,
+    keys: Iterable[str],
+    days: int,
+) -> dict[str, list[tuple[date, float]]]:
+    """Read back the daily statistics of the last days, oldest first, per key."""
+    if "recorder" not in hass.config.components:
+        return {}
+
+    ids = {statistic_id(entry_id, key): key for key in keys}
+    start = dt_util.start_of_local_day() - timedelta(days=days)
+    stats = await get_instance(hass).async_add_executor_job(
+        statistics_during_period, hass, start, None, set(ids), "hour", None, {"mean"}
+    )
+    return {
+        ids[stat_id]: [
+            (dt_util.as_local(dt_util.utc_from_timestamp(row["start"])).date(), row["mean"])
+            for row in rows
+            if row.get("mean") is not None
+        ]
+        for stat_id, rows in stats.items()
+    }
+
+
+def _get_field(record: dict[str, Any], field: str) -> Any:
+    """Read a possibly dotted field from a raw record."""
+    value: Any = record
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
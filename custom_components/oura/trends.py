@@ -0,0 +1,206 @@
+"""Rolling-window trends over the daily Oura records."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date
+from math import sqrt
+from operator import attrgetter
+from typing import Any
+
+TRENDS_LOOKUP = "trends"
+
+
+@dataclass(frozen=True, slots=True)
+class TrendMetric:
+    """A daily value kept over a window of days."""
+
+    key: str
+    lookup: str
+    field: str
+    days: int
+    # Daily statistic holding the same value, used to seed the window.
+    statistic: str
+
+
+TREND_METRICS = (
+    TrendMetric("readiness_7d", "daily_readiness", "score", 7, "daily_readiness"),
+    TrendMetric("sleep_score_14d", "daily_sleep", "score", 14, "daily_sleep"),
+    TrendMetric("hrv_14d", "sleep", "average_hrv", 14, "average_hrv"),
+    TrendMetric("steps_7d", "daily_activity", "steps", 7, "steps"),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class TrendStats:
+    """Statistics of one window, as published to the sensors."""
+
+    days: int
+    latest: float | None
+    mean: float | None
+    std: float | None
+    total: float | None
+    # How far the latest day is from the other days of the window.
+    z_score: float | None
+
+
+class Trends:
+    """Snapshot of every trend, published under the trends lookup."""
+
+    __slots__ = ("stats",)
+
+    def __init__(self, stats: Mapping[str, TrendStats]) -> None:
+        self.stats = dict(stats)
+
+    @property
+    def lookup(self):
+        return TRENDS_LOOKUP
+
+    def __getattr__(self, name: str) -> TrendStats:
+        try:
+            return self.stats[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Trends) and self.stats == other.stats
+
+    __hash__ = None
+
+
+class RollingWindow:
+    """The values of the last few days, with running sums for O(1) statistics.
+
+    Days are pushed in order. A value for the newest day replaces it, since
+    daily records keep changing until the day is over, and days that fall
+    out of the window are evicted from the left.
+    """
+
+    __slots__ = ("_days", "_sum", "_sum_sq", "_values", "days")
+
+    def __init__(self, days: int) -> None:
+        self.days = days
+        self._days: deque[int] = deque()
+        self._values: deque[float] = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, day: date, value: float) -> bool:
+        """Add the value of a day. Returns False when nothing changed."""
+        ordinal = day.toordinal()
+        days = self._days
+        values = self._values
+        if days and ordinal <= days[-1]:
+            if ordinal < days[-1] or values[-1] == value:
+                return False
+            old = values[-1]
+            values[-1] = value
+            self._sum += value - old
+            self._sum_sq += value * value - old * old
+            return True
+
+        days.append(ordinal)
+        values.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+        while days[0] <= ordinal - self.days:
+            days.popleft()
+            old = values.popleft()
+            self._sum -= old
+            self._sum_sq -= old * old
+        return True
+
+    def stats(self) -> TrendStats:
+        count = len(self._values)
+        if not count:
+            return TrendStats(0, None, None, None, None, None)
+
+        latest = self._values[-1]
+        mean = self._sum / count
+        std = sqrt(max(self._sum_sq / count - mean * mean, 0.0))
+
+        z_score = None
+        others = count - 1
+        if others >= 2:
+            others_mean = (self._sum - latest) / others
+            others_var = (self._sum_sq - latest * latest) / others - others_mean * others_mean
+            if others_var > 0:
+                z_score = round((latest - others_mean) / sqrt(others_var), 2)
+
+        return TrendStats(
+            days=count,
+            latest=latest,
+            mean=round(mean, 1),
+            std=round(std, 1),
+            total=self._sum,
+            z_score=z_score,
+        )
+
+    def history(self) -> list[tuple[str, float]]:
+        return [
+            (date.fromordinal(day).isoformat(), value)
+            for day, value in zip(self._days, self._values)
+        ]
+
+
+class TrendEngine:
+    """Feeds the daily models of each refresh into the trend windows."""
+
+    def __init__(self, metrics: Iterable[TrendMetric] = TREND_METRICS) -> None:
+        self.metrics = tuple(metrics)
+        self._windows = {metric.key: RollingWindow(metric.days) for metric in self.metrics}
+        self._getters = {metric.key: attrgetter(metric.field) for metric in self.metrics}
+        self.snapshot = self._build_snapshot()
+
+    @property
+    def lookups(self) -> set[str]:
+        """Lookups the trends are computed from."""
+        return {metric.lookup for metric in self.metrics}
+
+    def seed(self, key: str, history: Iterable[tuple[date | str, float]]) -> None:
+        """Add persisted days to a window, oldest first."""
+        window = self._windows.get(key)
+        if window is None:
+            return
+        for day, value in history:
+            if isinstance(day, str):
+                day = date.fromisoformat(day)
+            window.add(day, value)
+        self.snapshot = self._build_snapshot()
+
+    def empty(self) -> list[TrendMetric]:
+        """Return the metrics that have no days yet."""
+        return [metric for metric in self.metrics if not self._windows[metric.key]]
+
+    def update(self, lookup_table: Mapping[str, Any]) -> Trends:
+        """Add the days in a lookup table and return the current snapshot.
+
+        The snapshot is only rebuilt when a window changed, so an unchanged
+        refresh hands back the same object.
+        """
+        changed = False
+        for metric in self.metrics:
+            record = lookup_table.get(metric.lookup)
+            if record is None:
+                continue
+            try:
+                value = self._getters[metric.key](record)
+                day = date.fromisoformat(record.day)
+            except (AttributeError, ValueError):
+                continue
+            if value is not None and self._windows[metric.key].add(day, value):
+                changed = True
+
+        if changed:
+            self.snapshot = self._build_snapshot()
+        return self.snapshot
+
+    def as_dict(self) -> dict[str, list[tuple[str, float]]]:
+        return {key: window.history() for key, window in self._windows.items()}
+
+    def _build_snapshot(self) -> Trends:
+        return Trends({key: window.stats() for key, window in self._windows.items()})
@@ -0,0 +1,200 @@
+"""Webhook push mode for Oura."""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+from datetime import datetime
+from http import HTTPStatus
+
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, CONF_WEBHOOK_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.network import NoURLAvailableError
+from homeassistant.util import dt as dt_util
+
+from .api.client import InvalidOuraAPIResponseError
+from .api.models.base import json_loads
+from .api.scheduler import OuraRequestError
+from .api.subscriptions import OuraSubscriptionClient
+from .const import (
+    CONF_VERIFICATION_TOKEN,
+    DOMAIN,
+    PUSH_DATA_TYPES,
+    PUSH_EVENT_TYPES,
+    PUSH_FALLBACK_INTERVAL,
+    SUBSCRIPTION_RENEW_MARGIN,
+    WEBHOOK_API_ENDPOINT,
+)
+from .oura_update_coordinator import OuraUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OuraWebhookManager:
+    """Receives Oura webhook events and keeps the subscriptions alive.
+
+    Events only carry the data type and document id; the document itself is
+    fetched from the API with the user's token. Each event is signed with
+    the application's client secret and events whose signature does not
+    match are rejected.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: OuraUpdateCoordinator,
+        session,
+        scheduler,
+    ) -> None:
+        self.hass = hass
+        self._entry = entry
+        self._coordinator = coordinator
+        self._subscriptions = OuraSubscriptionClient(
+            WEBHOOK_API_ENDPOINT,
+            session,
+            entry.options[CONF_CLIENT_ID],
+            entry.options[CONF_CLIENT_SECRET],
+            scheduler,
+        )
+        self._client_secret: str = entry.options[CONF_CLIENT_SECRET]
+        self._webhook_id: str = entry.data[CONF_WEBHOOK_ID]
+        self._verification_token: str = entry.data[CONF_VERIFICATION_TOKEN]
+        self._subscription_ids: list[str] = []
+        self._cancel_renew: CALLBACK_TYPE | None = None
+
+    async def async_setup(self) -> bool:
+        """Register the webhook and subscribe to every pushed data type."""
+        try:
+            callback_url = webhook.async_generate_url(
+                self.hass, self._webhook_id, prefer_external=True
+            )
+        except NoURLAvailableError:
+            _LOGGER.warning("Oura push mode needs an external URL, falling back to polling")
+            return False
+
+        webhook.async_register(
+            self.hass,
+            DOMAIN,
+            self._entry.title,
+            self._webhook_id,
+            self._async_handle_webhook,
+            allowed_methods=("GET", "POST"),
+        )
+
+        try:
+            expirations = await self._async_subscribe(callback_url)
+        except (InvalidOuraAPIResponseError, OuraRequestError) as err:
+            _LOGGER.warning("Failed to subscribe to Oura webhooks, falling back to polling: %s", err)
+            webhook.async_unregister(self.hass, self._webhook_id)
+            return False
+
+        self._coordinator.set_push_endpoints(set(PUSH_DATA_TYPES), PUSH_FALLBACK_INTERVAL)
+        self._schedule_renew(expirations)
+        return True
+
+    async def _async_subscribe(self, callback_url: str) -> list[datetime]:
+        """Reuse matching subscriptions and create the missing ones."""
+        existing = {
+            (sub["data_type"], sub["event_type"]): sub
+            for sub in await self._subscriptions.async_list()
+            if sub.get("callback_url") == callback_url
+        }
+        expirations = []
+        for data_type in PUSH_DATA_TYPES:
+            for event_type in PUSH_EVENT_TYPES:
+                subscription = existing.get((data_type, event_type))
+                if subscription is None:
+                    subscription = await self._subscriptions.async_create(
+                        callback_url, self._verification_token, event_type, data_type
+                    )
+                self._subscription_ids.append(subscription["id"])
+                expiration = dt_util.parse_datetime(subscription.get("expiration_time") or "")
+                if expiration is not None:
+                    expirations.append(expiration)
+        return expirations
+
+    @callback
+    def _schedule_renew(self, expirations: list[datetime]) -> None:
+        if not expirations:
+            return
+        self._cancel_renew = async_track_point_in_utc_time(
+            self.hass,
+            self._async_renew,
+            min(expirations) - SUBSCRIPTION_RENEW_MARGIN,
+        )
+
+    async def _async_renew(self, _now: datetime) -> None:
+        """Renew every subscription ahead of its expiry."""
+        self._cancel_renew = None
+        expirations = []
+        for subscription_id in self._subscription_ids:
+            try:
+                renewed = await self._subscriptions.async_renew(subscription_id)
+            except (InvalidOuraAPIResponseError, OuraRequestError) as err:
+                _LOGGER.warning("Failed to renew Oura subscription %s: %s", subscription_id, err)
+                continue
+            expiration = dt_util.parse_datetime(renewed.get("expiration_time") or "")
+            if expiration is not None:
+                expirations.append(expiration)
+        self._schedule_renew(expirations or [dt_util.utcnow() + SUBSCRIPTION_RENEW_MARGIN * 2])
+
+    async def async_unload(self) -> None:
+        """Delete the subscriptions and unregister the webhook."""
+        if self._cancel_renew is not None:
+            self._cancel_renew()
+            self._cancel_renew = None
+        webhook.async_unregister(self.hass, self._webhook_id)
+        for subscription_id in self._subscription_ids:
+            try:
+                await self._subscriptions.async_delete(subscription_id)
+            except (InvalidOuraAPIResponseError, OuraRequestError) as err:
+                _LOGGER.debug("Failed to delete Oura subscription %s: %s", subscription_id, err)
+        self._subscription_ids.clear()
+
+    async def _async_handle_webhook(
+        self, hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        """Answer verification challenges and apply pushed events."""
+        if request.method == "GET":
+            if request.query.get("verification_token") != self._verification_token:
+                return web.Response(status=HTTPStatus.UNAUTHORIZED)
+            return web.json_response({"challenge": request.query.get("challenge")})
+
+        body = await request.read()
+        if not self._valid_signature(request, body):
+            return web.Response(status=HTTPStatus.UNAUTHORIZED)
+
+        try:
+            event = json_loads(body)
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+        if not isinstance(event, dict):
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+
+        data_type = event.get("data_type")
+        object_id = event.get("object_id")
+        if data_type in PUSH_DATA_TYPES and object_id and event.get("event_type") != "delete":
+            self._entry.async_create_background_task(
+                hass,
+                self._coordinator.async_apply_push(data_type, object_id),
+                f"{DOMAIN} push {data_type}",
+            )
+        return web.Response(status=HTTPStatus.OK)
+
+    def _valid_signature(self, request: web.Request, body: bytes) -> bool:
+        """Check the HMAC-SHA256 of the timestamp and body against the signature header."""
+        signature = request.headers.get("x-oura-signature")
+        timestamp = request.headers.get("x-oura-timestamp")
+        if not signature or not timestamp:
+            return False
+        expected = hmac.new(
+            self._client_secret.encode(),
+            timestamp.encode() + body,
+            hashlib.sha256,
+        ).hexdigest()
+        return hmac.compare_digest(expected.upper(), signature.upper())
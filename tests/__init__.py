@@ -0,0 +1 @@
+"""Tests for the Oura integration."""
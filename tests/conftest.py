@@ -0,0 +1,8 @@
+"""Fixtures for the Oura integration tests."""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load custom integrations in every test."""
+    yield
@@ -0,0 +1,66 @@
+"""Tests for the learned arrival windows."""
+from datetime import timedelta
+
+from custom_components.oura.arrival import ArrivalWindows
+from custom_components.oura.const import (
+    ARRIVAL_BACKOFF,
+    ARRIVAL_DEFAULT_WINDOW,
+    ARRIVAL_MIN_SPREAD,
+)
+
+INTERVAL = timedelta(minutes=10)
+MIN_SPREAD = int(ARRIVAL_MIN_SPREAD.total_seconds() / 60)
+
+
+def test_default_window() -> None:
+    assert ArrivalWindows().window("daily_sleep") == ARRIVAL_DEFAULT_WINDOW
+
+
+def test_window_is_median_widened_by_spread() -> None:
+    """The window is centred on the median and ignores a single outlier."""
+    windows = ArrivalWindows({"daily_sleep": [420, 425, 430, 435, 440, 1200]})
+
+    # Median 432.5; the deviation is small, so the minimum spread applies.
+    assert windows.window("daily_sleep") == (int(432.5 - MIN_SPREAD), int(432.5 + MIN_SPREAD))
+
+
+def test_window_widens_with_scattered_arrivals() -> None:
+    """Twice the median absolute deviation is used once it exceeds the minimum spread."""
+    windows = ArrivalWindows({"sleep": [300, 360, 420, 480, 540]})
+
+    # Median 420, absolute deviations 120, 60, 0, 60, 120: MAD 60.
+    assert windows.window("sleep") == (420 - 120, 420 + 120)
+
+
+def test_next_poll() -> None:
+    """Polls are fast inside the window, backed off after it and wait a day after arrival."""
+    windows = ArrivalWindows({"daily_readiness": [480] * 5})
+    start, end = windows.window("daily_readiness")
+
+    assert windows.next_poll("daily_readiness", start - 60, False, INTERVAL) == timedelta(minutes=60)
+    assert windows.next_poll("daily_readiness", start + 5, False, INTERVAL) == INTERVAL
+    assert windows.next_poll("daily_readiness", end + 5, False, INTERVAL) == ARRIVAL_BACKOFF
+
+    # Once today's record is in, wait for the start of tomorrow's window.
+    minute = start + 20
+    assert windows.next_poll("daily_readiness", minute, True, INTERVAL) == timedelta(
+        minutes=24 * 60 - minute + start
+    )
+
+
+def test_next_poll_never_shorter_than_interval() -> None:
+    windows = ArrivalWindows({"daily_readiness": [480] * 5})
+    start, _ = windows.window("daily_readiness")
+
+    assert windows.next_poll("daily_readiness", start - 1, False, INTERVAL) == INTERVAL
+
+
+def test_samples_round_trip() -> None:
+    """Samples survive as_dict, keeping only the latest ones."""
+    windows = ArrivalWindows()
+    for minute in range(30):
+        windows.add("sleep", 400 + minute)
+
+    restored = ArrivalWindows(windows.as_dict())
+    assert restored.window("sleep") == windows.window("sleep")
+    assert len(windows.as_dict()["sleep"]) < 30
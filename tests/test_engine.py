@@ -0,0 +1,121 @@
+"""Tests for the hub's refresh engine."""
+import asyncio
+import itertools
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.oura.engine import RefreshEngine
+
+INTERVAL = timedelta(minutes=5)
+
+
+class FakeCoordinator:
+    """Records the refreshes and publishes the engine asks for."""
+
+    def __init__(self, endpoints: list[str]) -> None:
+        self.endpoints = endpoints
+        self.refreshed: list[str] = []
+        self.published = 0
+
+    def endpoint_interval(self, endpoint: str) -> timedelta:
+        return INTERVAL
+
+    async def async_refresh_endpoint(self, endpoint: str) -> None:
+        self.refreshed.append(endpoint)
+
+    def async_publish(self) -> None:
+        self.published += 1
+
+
+def _hass() -> SimpleNamespace:
+    loop = asyncio.get_running_loop()
+    return SimpleNamespace(
+        loop=loop,
+        async_create_background_task=lambda target, name: loop.create_task(target),
+    )
+
+
+async def test_jobs_are_spread_over_the_interval() -> None:
+    """Endpoints added together are placed at evenly spread points of their interval."""
+    engine = RefreshEngine(_hass())
+    now = asyncio.get_running_loop().time()
+    engine.async_add("entry", FakeCoordinator([f"endpoint_{index}" for index in range(5)]))
+    engine.async_stop()
+
+    interval = INTERVAL.total_seconds()
+    offsets = sorted(due - now for due, *_ in engine._queue)
+    assert len(offsets) == 5
+    assert all(0 <= offset < interval for offset in offsets)
+    gaps = [later - earlier for earlier, later in itertools.pairwise(offsets)]
+    assert min(gaps) > interval / 10
+
+
+async def test_jobs_due_together_are_coalesced() -> None:
+    """Jobs due within the window run in one tick and each account publishes once."""
+    engine = RefreshEngine(_hass(), workers=2)
+    first = FakeCoordinator(["daily_sleep", "daily_readiness"])
+    second = FakeCoordinator(["daily_activity"])
+    engine._coordinators.update({"first": first, "second": second})
+
+    now = asyncio.get_running_loop().time()
+    engine._push(now - 0.1, "first", "daily_sleep", first)
+    engine._push(now + 0.5, "first", "daily_readiness", first)
+    engine._push(now + 1.0, "second", "daily_activity", second)
+    engine._push(now + 60, "second", "heartrate", second)
+
+    engine._task = asyncio.get_running_loop().create_task(engine._async_run())
+    for _ in range(10):
+        await asyncio.sleep(0)
+    engine.async_stop()
+
+    assert engine.ticks == 1
+    assert engine.jobs_run == 3
+    assert sorted(first.refreshed) == ["daily_readiness", "daily_sleep"]
+    assert second.refreshed == ["daily_activity"]
+    assert (first.published, second.published) == (1, 1)
+    # The job outside the window is still queued, and the others come back
+    # one interval later.
+    dues = sorted(due - now for due, *_ in engine._queue)
+    assert dues[0] == pytest.approx(60)
+    assert len(dues) == 4
+
+
+async def test_removed_entries_are_dropped() -> None:
+    """Jobs of a removed entry are skipped when they come due."""
+    engine = RefreshEngine(_hass())
+    coordinator = FakeCoordinator(["daily_sleep"])
+    engine._coordinators["entry"] = coordinator
+    engine._push(asyncio.get_running_loop().time() - 1, "entry", "daily_sleep", coordinator)
+    engine.async_remove("entry")
+
+    engine._task = asyncio.get_running_loop().create_task(engine._async_run())
+    for _ in range(10):
+        await asyncio.sleep(0)
+    engine.async_stop()
+
+    assert coordinator.refreshed == []
+    assert not engine._queue
+
+
+async def test_publish_error_does_not_stop_the_engine() -> None:
+    """An account failing to publish is logged and the other accounts still publish."""
+    engine = RefreshEngine(_hass())
+    broken = FakeCoordinator(["daily_sleep"])
+    broken.async_publish = lambda: 1 / 0
+    healthy = FakeCoordinator(["daily_sleep"])
+    engine._coordinators.update({"broken": broken, "healthy": healthy})
+    now = asyncio.get_running_loop().time()
+    engine._push(now - 1, "broken", "daily_sleep", broken)
+    engine._push(now - 1, "healthy", "daily_sleep", healthy)
+
+    engine._task = asyncio.get_running_loop().create_task(engine._async_run())
+    for _ in range(10):
+        await asyncio.sleep(0)
+    running = not engine._task.done()
+    engine.async_stop()
+
+    assert running
+    assert healthy.published == 1
+    assert len(engine._queue) == 2
@@ -0,0 +1,47 @@
+"""Tests for the Oura base entity."""
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from homeassistant.config_entries import current_entry
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.oura.const import DOMAIN
+from custom_components.oura.entity import OuraBaseEntity
+from custom_components.oura.oura_update_coordinator import OuraUpdateCoordinator
+from custom_components.oura.snapshot import Snapshot
+
+RING = SimpleNamespace(id="ring", color="silver", design="heritage", hardware_type="gen3")
+
+
+def _snapshot(version: int, changed: set[str]) -> Snapshot:
+    data = {"ring": RING, "daily_resilience": object(), "vo2_max": object()}
+    return Snapshot(data, version, MappingProxyType({}), frozenset(changed))
+
+
+async def test_entity_only_written_when_its_lookup_changed(hass: HomeAssistant) -> None:
+    """An entity whose lookup did not change is not written."""
+    entry = MockConfigEntry(domain=DOMAIN, title="Oura")
+    entry.add_to_hass(hass)
+    token = current_entry.set(entry)
+    try:
+        client = MagicMock(endpoints=["daily_resilience", "vo2_max"])
+        coordinator = OuraUpdateCoordinator(hass, client)
+    finally:
+        current_entry.reset(token)
+    coordinator.async_set_updated_data(_snapshot(1, {"ring", "daily_resilience", "vo2_max"}))
+
+    resilience = OuraBaseEntity(coordinator, "daily_resilience", "Oura")
+    vo2_max = OuraBaseEntity(coordinator, "vo2_max", "Oura")
+    await resilience.async_added_to_hass()
+    await vo2_max.async_added_to_hass()
+
+    with (
+        patch.object(resilience, "async_write_ha_state") as resilience_write,
+        patch.object(vo2_max, "async_write_ha_state") as vo2_max_write,
+    ):
+        coordinator.async_set_updated_data(_snapshot(2, {"vo2_max"}))
+
+    resilience_write.assert_not_called()
+    vo2_max_write.assert_called_once()
+    assert coordinator.skipped_writes >= 1
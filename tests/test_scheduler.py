@@ -0,0 +1,123 @@
+"""Tests for the Oura request scheduler."""
+import pytest
+from aiohttp import ClientError
+
+from custom_components.oura.api.scheduler import (
+    OuraCircuitOpenError,
+    OuraServiceUnavailableError,
+    RequestScheduler,
+)
+
+
+class FakeResponse:
+    def __init__(self, status: int, headers: dict[str, str] | None = None) -> None:
+        self.status = status
+        self.headers = headers or {}
+        self.released = False
+
+    def release(self) -> None:
+        self.released = True
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_backoff_is_jittered_and_capped() -> None:
+    """Backoff stays between zero and the capped exponential delay."""
+    scheduler = RequestScheduler(base_backoff=1.0, max_backoff=5.0)
+    for attempt in range(1, 8):
+        limit = min(5.0, 2.0**attempt)
+        delays = [scheduler._backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= limit for delay in delays)
+
+
+async def test_retries_transient_failures() -> None:
+    """5xx responses and connection errors are retried until one succeeds."""
+    scheduler = RequestScheduler(base_backoff=0)
+    responses = [ClientError("reset"), FakeResponse(503), FakeResponse(200)]
+
+    async def send():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    response = await scheduler.async_run(send)
+
+    assert response.status == 200
+    assert scheduler.retries == 2
+    assert scheduler.requests == 3
+    assert not scheduler.circuit_open
+
+
+async def test_gives_up_after_max_retries() -> None:
+    """The last error is raised once the retries are used up."""
+    scheduler = RequestScheduler(base_backoff=0, max_retries=2)
+    failed = FakeResponse(500)
+
+    async def send():
+        return failed
+
+    with pytest.raises(OuraServiceUnavailableError):
+        await scheduler.async_run(send)
+    assert scheduler.requests == 3
+    assert failed.released
+
+
+async def test_circuit_opens_and_closes_after_cooldown() -> None:
+    """Consecutive failures open the circuit until the cooldown has passed."""
+    clock = FakeClock()
+    scheduler = RequestScheduler(
+        base_backoff=0,
+        max_retries=0,
+        breaker_threshold=2,
+        breaker_cooldown=60.0,
+        clock=clock,
+    )
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        raise ClientError("down")
+
+    for _ in range(2):
+        with pytest.raises(OuraServiceUnavailableError):
+            await scheduler.async_run(fail)
+    assert scheduler.circuit_open
+    assert scheduler.circuit_trips == 1
+
+    with pytest.raises(OuraCircuitOpenError):
+        await scheduler.async_run(fail)
+    assert calls == 2
+
+    clock.now += 61
+
+    async def succeed():
+        return FakeResponse(200)
+
+    assert not scheduler.circuit_open
+    assert (await scheduler.async_run(succeed)).status == 200
+    assert scheduler.diagnostics()["consecutive_failures"] == 0
+
+
+async def test_backoff_not_started_past_timeout() -> None:
+    """A retry whose backoff would outlast the caller's timeout is not attempted."""
+    scheduler = RequestScheduler(base_backoff=100.0, max_backoff=100.0, max_retries=3)
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        raise ClientError("reset")
+
+    scheduler._backoff = lambda attempt: 50.0
+    with pytest.raises(OuraServiceUnavailableError):
+        await scheduler.async_run(fail, timeout=1.0)
+    assert calls == 1
+    assert scheduler.retries == 0
@@ -0,0 +1,60 @@
+"""Tests for splitting collection responses into records."""
+import json
+
+import pytest
+
+from custom_components.oura.api.stream import RecordStream
+
+BODY = json.dumps(
+    {
+        "data": [
+            {"id": "a", "day": "2024-01-01", "score": 80},
+            {"id": "b", "note": "brace } and \"quote\" [", "contributors": {"hrv": 70}},
+            {"id": "c", "items": [1, 2, {"x": "]"}]},
+        ],
+        "next_token": "token",
+    }
+).encode()
+
+
+def _read(chunks: list[bytes]) -> tuple[list[dict], dict]:
+    stream = RecordStream()
+    records = []
+    for chunk in chunks:
+        records.extend(json.loads(record) for record in stream.feed(chunk))
+    return records, stream.close()
+
+
+def test_records_and_envelope() -> None:
+    """Every record is returned and the envelope keeps the rest of the body."""
+    records, envelope = _read([BODY])
+
+    assert records == json.loads(BODY)["data"]
+    assert envelope == {"data": [], "next_token": "token"}
+
+
+def test_records_split_across_chunk_boundaries() -> None:
+    """Records cut at any byte, including inside strings, are put back together."""
+    expected = json.loads(BODY)["data"]
+    for cut in range(1, len(BODY)):
+        records, envelope = _read([BODY[:cut], BODY[cut:]])
+        assert records == expected, cut
+        assert envelope["next_token"] == "token"
+
+
+def test_records_fed_byte_by_byte() -> None:
+    """Records are returned as soon as their closing brace arrives."""
+    stream = RecordStream()
+    completed = [len(stream.feed(BODY[index:index + 1])) for index in range(len(BODY))]
+
+    assert sum(completed) == 3
+    assert stream.close()["next_token"] == "token"
+
+
+def test_truncated_body() -> None:
+    """A body that ends inside a record is an error."""
+    stream = RecordStream()
+    stream.feed(BODY[: BODY.index(b'"b"')])
+
+    with pytest.raises(ValueError):
+        stream.close()
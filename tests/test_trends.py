@@ -0,0 +1,69 @@
+"""Tests for the rolling-window trends."""
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+from custom_components.oura.trends import RollingWindow
+
+START = date(2024, 1, 1)
+
+
+def _day(offset: int) -> date:
+    return START + timedelta(days=offset)
+
+
+def test_days_outside_the_window_are_evicted() -> None:
+    """Only the last few days are kept, counted by date rather than by entry."""
+    window = RollingWindow(3)
+    for offset in range(5):
+        assert window.add(_day(offset), float(offset))
+
+    assert len(window) == 3
+    assert [day for day, _ in window.history()] == [_day(2).isoformat(), _day(3).isoformat(), _day(4).isoformat()]
+
+    # A gap of several days evicts everything older than the window.
+    window.add(_day(10), 10.0)
+    assert window.history() == [(_day(10).isoformat(), 10.0)]
+
+
+def test_newest_day_is_replaced() -> None:
+    """A new value for the newest day replaces it; older days are ignored."""
+    window = RollingWindow(7)
+    window.add(_day(0), 70.0)
+    window.add(_day(1), 80.0)
+
+    assert window.add(_day(1), 90.0)
+    assert window.history() == [(_day(0).isoformat(), 70.0), (_day(1).isoformat(), 90.0)]
+    assert window.stats().mean == 80.0
+
+    assert not window.add(_day(1), 90.0)
+    assert not window.add(_day(0), 10.0)
+    assert len(window) == 2
+
+
+def test_stats_match_statistics_module() -> None:
+    """The running sums give the same statistics as computing them from scratch."""
+    window = RollingWindow(7)
+    values = [62.0, 75.0, 71.0, 80.0, 68.0, 77.0, 90.0, 55.0, 83.0]
+    for offset, value in enumerate(values):
+        window.add(_day(offset), value)
+
+    kept = values[-7:]
+    stats = window.stats()
+    assert stats.days == 7
+    assert stats.latest == kept[-1]
+    assert stats.mean == round(statistics.fmean(kept), 1)
+    assert stats.std == round(statistics.pstdev(kept), 1)
+    assert stats.total == pytest.approx(sum(kept))
+
+    others = kept[:-1]
+    expected = (kept[-1] - statistics.fmean(others)) / statistics.pstdev(others)
+    assert stats.z_score == round(expected, 2)
+
+
+def test_empty_window() -> None:
+    stats = RollingWindow(7).stats()
+    assert stats.days == 0
+    assert stats.mean is None
+    assert stats.z_score is None